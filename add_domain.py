@@ -8,13 +8,15 @@ def add_domain(domain):
     url = "http://localhost:5000/api/domains"
     try:
         response = requests.post(url, json={"domain": domain})
+        # Parse the body once; error pages may not be JSON
+        data = response.json() if response.headers.get('content-type', '').startswith('application/json') else None
         if response.status_code == 201:
             print(f"Domain {domain} added successfully!")
         elif response.status_code == 409:
             print(f"Domain {domain} already exists!")
         else:
             print(f"Error: {response.status_code} - {response.text}")
-        return response.json()
+        return data
     except Exception as e:
         print(f"Error: {str(e)}")
         return None
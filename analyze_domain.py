@@ -9,15 +9,16 @@ def analyze_domain(domain):
     try:
         print(f"Analyzing domain: {domain}")
         response = requests.get(url)
-        if response.status_code == 200:
-            result = response.json()
+        # Parse the body once; error pages may not be JSON
+        result = response.json() if response.headers.get('content-type', '').startswith('application/json') else None
+        if response.status_code == 200 and result is not None:
             print(f"Domain: {result.get('domain')}")
             print(f"Status: {result.get('status')}")
             print(f"Company name: {result.get('company_name')}")
             print(f"Contact URL: {result.get('contact_url')}")
         else:
             print(f"Error: {response.status_code} - {response.text}")
-        return response.json()
+        return result
     except Exception as e:
         print(f"Error: {str(e)}")
         return None
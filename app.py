@@ -13,13 +13,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-logger.info("Application starting...")
-logger.info(f"Python version: {sys.version}")
-logger.info(f"Current directory: {os.getcwd()}")
-logger.info(f"Directory contents: {os.listdir('.')}")
-logger.info(f"Environment variables: {[key for key in os.environ.keys() if key.startswith(('PORT', 'PYTHON', 'ENABLE'))]}")
+def _log_startup():
+    """Log diagnostic information about the runtime environment"""
+    logger.info("Application starting...")
+    logger.info(f"Python version: {sys.version}")
+    logger.info(f"Current directory: {os.getcwd()}")
+    logger.info(f"Directory contents: {os.listdir('.')}")
+    logger.info(f"Environment variables: {[key for key in os.environ.keys() if key.startswith(('PORT', 'PYTHON', 'ENABLE'))]}")
 
 if __name__ == "__main__":
+    _log_startup()
     port = int(os.environ.get('PORT', 5000))
     logger.info(f"Starting web server on port {port}")
     app.run(debug=False, host='0.0.0.0', port=port)
\ No newline at end of file
@@ -2,11 +2,24 @@
 Advanced company name extractor from website content
 """
 import re
+import functools
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 import time
 import random
 import logging
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+# Optional SIMD multi-pattern prefilter
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 # Configure logging
 logging.basicConfig(
@@ -15,66 +28,288 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Legal entity suffixes shared by most company patterns
+_LEGAL_SUFFIX = r"(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.)"
+
+# Comprehensive patterns for finding company names, each tagged with a
+# confidence tier (1 = most reliable). Lower tiers are only scanned when
+# the higher ones produce no valid candidate.
+_RAW_COMPANY_PATTERNS = [
+    # Standard copyright patterns
+    (1, r"(?:©|copyright|\(c\))\s*(?:20\d{2}(?:-20\d{2})?)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+" + _LEGAL_SUFFIX + r")"),
+    
+    # Just copyright year and name without legal suffix
+    (4, r"(?:©|copyright|\(c\))\s*(?:20\d{2}(?:-20\d{2})?)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]{3,50})"),
+    
+    # Legal/data controller/processor patterns
+    (2, r"(?:data\s+controller|data\s+processor|data\s+owner)\s+is\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+" + _LEGAL_SUFFIX + r")"),
+    
+    # Operated by patterns
+    (2, r"(?:is\s+owned\s+and\s+operated\s+by|trading\s+as|t/a|operated\s+by)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+" + _LEGAL_SUFFIX + r")"),
+    
+    # Developed by patterns
+    (4, r"(?:developed|powered)\s+by\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+" + _LEGAL_SUFFIX + r")"),
+    
+    # Footer company with All rights reserved
+    (1, r"([A-Z][a-zA-Z0-9\s\&\-'.,]+" + _LEGAL_SUFFIX + r")(?:\s+All\s+[Rr]ights\s+[Rr]eserved)"),
+    
+    # Contact us / about us section company names
+    (4, r"(?:Contact|About)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+" + _LEGAL_SUFFIX + r")"),
+    
+    # Company with registered address
+    (2, r"([A-Z][a-zA-Z0-9\s\&\-'.,]+" + _LEGAL_SUFFIX + r")(?:\s+is\s+registered\s+at)"),
+    
+    # Company with registration number
+    (2, r"(?:Company\s+Registration\s+(?:Number|No)\.?:?\s+\d+\s*[-–]\s*([A-Z][a-zA-Z0-9\s\&\-'.,]+))"),
+    (2, r"([A-Z][a-zA-Z0-9\s\&\-'.,]+)(?:\s+Company\s+Registration\s+(?:Number|No)\.?:?\s+\d+)"),
+    
+    # Company with VAT number
+    (2, r"(?:VAT\s+(?:Number|No)\.?:?\s+\d+\s*[-–]\s*([A-Z][a-zA-Z0-9\s\&\-'.,]+))"),
+    (2, r"([A-Z][a-zA-Z0-9\s\&\-'.,]+)(?:\s+VAT\s+(?:Number|No)\.?:?\s+\d+)"),
+    
+    # Company name in typical about page phrases
+    (4, r"(?:was\s+founded\s+(?:in|by))\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+" + _LEGAL_SUFFIX + r")"),
+    (4, r"(?:welcome\s+to)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+" + _LEGAL_SUFFIX + r")")
+]
+
+# Footers and meta tags are read from the parsed DOM rather than with regexes
+# over the markup; these are the tiers their candidates count towards
+_META_TIER = 3
+_FOOTER_TIER = 4
+
+# Company name in an author/og:site_name meta tag's content attribute
+_META_COMPANY_RE = re.compile(r"[A-Z][a-zA-Z0-9\s\&\-'.,]+" + _LEGAL_SUFFIX, re.IGNORECASE)
+
+# Simple company name in footer text (less reliable). Footer text is joined
+# with newlines between nodes, so a match never spans two elements.
+_FOOTER_COMPANY_RE = re.compile(r"[A-Z][a-zA-Z0-9 \t\u00a0\&\-'.,]{2,50}" + _LEGAL_SUFFIX, re.IGNORECASE)
+
+# Patterns for finding privacy policy URLs
+_RAW_PRIVACY_POLICY_PATTERNS = [
+    r'<a[^>]*href="([^"]*privacy[^"]*)"[^>]*>',
+    r'<a[^>]*href="([^"]*policy[^"]*)"[^>]*>',
+    r'<a[^>]*href="([^"]*terms[^"]*)"[^>]*>',
+    r'<a[^>]*href="([^"]*imprint[^"]*)"[^>]*>',
+    r'<a[^>]*href="([^"]*impressum[^"]*)"[^>]*>',
+    r'<a[^>]*href="([^"]*legal[^"]*)"[^>]*>'
+]
+
+# Compile once at import time so every extractor instance shares the same objects
+_COMPANY_PATTERNS = [re.compile(p, re.IGNORECASE | re.DOTALL) for _, p in _RAW_COMPANY_PATTERNS]
+_PRIVACY_POLICY_PATTERNS = [re.compile(p, re.IGNORECASE) for p in _RAW_PRIVACY_POLICY_PATTERNS]
+
+@functools.lru_cache(maxsize=256)
+def _fused_company_pattern(pattern_ids):
+    """
+    Fuse the company patterns with the given indices into one alternation
+    
+    Each branch is wrapped in a named group p<index>; the pattern's own capture
+    group is the one immediately following it.
+    """
+    return re.compile(
+        '|'.join(f'(?P<p{i}>{_RAW_COMPANY_PATTERNS[i][1]})' for i in pattern_ids),
+        re.IGNORECASE | re.DOTALL
+    )
+
+# Company pattern indices of each confidence tier, most reliable tier first.
+# Each tier is fused into one alternation so the text is scanned once per tier.
+# A tier may have no regex patterns and only receive DOM candidates.
+_COMPANY_PATTERN_TIERS = [
+    (tier, tuple(i for i, (t, _) in enumerate(_RAW_COMPANY_PATTERNS) if t == tier))
+    for tier in sorted({t for t, _ in _RAW_COMPANY_PATTERNS} | {_META_TIER, _FOOTER_TIER})
+]
+
+# Patterns that can match text without a legal suffix in it
+_SUFFIXLESS_PATTERN_IDS = frozenset(i for i, (_, p) in enumerate(_RAW_COMPANY_PATTERNS) if _LEGAL_SUFFIX not in p)
+
+# Compile the full and suffix-free alternation of each tier up front
+for _, _tier_ids in _COMPANY_PATTERN_TIERS:
+    if _tier_ids:
+        _fused_company_pattern(_tier_ids)
+    _suffixless_ids = tuple(i for i in _tier_ids if i in _SUFFIXLESS_PATTERN_IDS)
+    if _suffixless_ids:
+        _fused_company_pattern(_suffixless_ids)
+
+def _build_hyperscan_database():
+    """
+    Compile all company patterns into one Hyperscan database
+    
+    Hyperscan only reports which patterns match, not capture groups, so it is
+    used as a prefilter that decides which patterns the re module has to run.
+    
+    Returns:
+        A hyperscan.Database, or None if Hyperscan is unavailable
+    """
+    if hyperscan is None:
+        return None
+    
+    expressions = [p.encode('utf-8') for _, p in _RAW_COMPANY_PATTERNS]
+    flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_DOTALL | hyperscan.HS_FLAG_UTF8 |
+             hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH)
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[flags] * len(expressions)
+        )
+    except hyperscan.error as e:
+        logger.warning(f"Could not compile Hyperscan database, falling back to re: {str(e)}")
+        return None
+    
+    return database
+
+_HYPERSCAN_DB = _build_hyperscan_database()
+
+# Hyperscan scratch space cannot be shared between concurrent scans
+_hyperscan_local = threading.local()
+
+# Cheap pre-check: patterns containing _LEGAL_SUFFIX can only match if this does
+_LEGAL_SUFFIX_RE = re.compile(_LEGAL_SUFFIX, re.IGNORECASE)
+
+# Helper patterns used during text cleanup and normalization
+_WHITESPACE_RE = re.compile(r'\s+')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+# Page regions extract_relevant_text takes text from
+_RELEVANT_TEXT_SELECTOR = (
+    'title, meta[name="author"], meta[property="og:site_name"], '
+    'footer, [class*="copyright"], [class*="footer"], [id*="footer"], [class*="legal"], '
+    'h1, h2, p, li, address'
+)
+
+# Concurrency limits for fetching URL variants and policy pages of a single domain
+MAX_VARIANT_WORKERS = 4
+MAX_POLICY_WORKERS = 4
+
+# Limits on how much input the company patterns are run against
+MAX_SCAN_CHARS = 200000
+TAIL_SCAN_CHARS = 10000
+
+# Default number of per-domain results kept in the extractor's LRU cache
+DEFAULT_CACHE_SIZE = 10000
+
+# Phrases that mark a short candidate as a false positive
+_SUSPICIOUS_PHRASES = (
+    "all rights reserved",
+    "privacy policy",
+    "terms of service",
+    "cookie policy",
+    "sitemap",
+    "contact us",
+    "about us"
+)
+
+# Legal entity types removed when comparing company names
+_NORMALIZE_LEGAL_SUFFIXES = (
+    "ltd", "limited", "llc", "inc", "corp", "corporation",
+    "gmbh", "b.v.", "pty ltd", "s.a.", "co."
+)
+_NORMALIZE_SUFFIX_RE = re.compile(
+    r'(?:\s*(?:' + '|'.join(re.escape(suffix) for suffix in _NORMALIZE_LEGAL_SUFFIXES) + r'))+\s*$'
+)
+
+@functools.lru_cache(maxsize=1024)
+def validate_company_name(name):
+    """
+    Basic validation for a potential company name
+    
+    Results are memoized since the same candidate usually repeats across a page.
+    
+    Args:
+        name: Company name to validate
+    
+    Returns:
+        True if valid, False otherwise
+    """
+    # Must be at least 3 characters
+    if not name or len(name) < 3:
+        return False
+    
+    # Must contain at least one letter
+    if not any(c.isalpha() for c in name):
+        return False
+    
+    # Check for suspicious patterns indicating false positive
+    lower_name = name.lower()
+    for pattern in _SUSPICIOUS_PHRASES:
+        if pattern in lower_name and len(name) < 30:  # Short matches likely false positives
+            return False
+    
+    return True
+
+def _inside_footer(node):
+    """
+    Check whether a DOM node sits inside a <footer> element
+    
+    Args:
+        node: A selectolax node
+    
+    Returns:
+        True if any ancestor is a <footer>, False otherwise
+    """
+    parent = node.parent
+    while parent is not None:
+        if parent.tag == 'footer':
+            return True
+        parent = parent.parent
+    return False
+
+@functools.lru_cache(maxsize=1024)
+def normalize_company_name(name):
+    """
+    Normalize company name for comparison
+    
+    Args:
+        name: Company name to normalize
+    
+    Returns:
+        Normalized company name
+    """
+    if not name:
+        return ""
+    
+    # Convert to lowercase
+    normalized = name.lower()
+    
+    # Remove common legal entity types for comparison
+    normalized = _NORMALIZE_SUFFIX_RE.sub('', normalized).strip()
+    
+    # Remove punctuation
+    normalized = _PUNCTUATION_RE.sub('', normalized)
+    
+    # Normalize whitespace
+    normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
+    
+    return normalized
+
 class CompanyNameExtractor:
     """
     Advanced extractor for finding company names in website content,
     specializing in privacy policies, footers, and about pages
     """
     
-    def __init__(self, use_language_model=False):
+    def __init__(self, use_language_model=False, cache_size=DEFAULT_CACHE_SIZE, max_retries=3):
         """
         Initialize the extractor with configurable options
         
         Args:
             use_language_model: Whether to use NLP for advanced extraction (not implemented)
+            cache_size: Maximum number of domain results to keep cached (0 disables caching)
+            max_retries: Number of retries for transient HTTP failures
         """
         self.use_language_model = use_language_model
         
+        # LRU cache of analyzed domains, most recently used last
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         # Comprehensive patterns for finding company names
-        self.company_patterns = [
-            # Standard copyright patterns
-            r"(?:©|copyright|\(c\))\s*(?:20\d{2}(?:-20\d{2})?)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
-            
-            # Just copyright year and name without legal suffix
-            r"(?:©|copyright|\(c\))\s*(?:20\d{2}(?:-20\d{2})?)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]{3,50})",
-            
-            # Legal/data controller/processor patterns
-            r"(?:data\s+controller|data\s+processor|data\s+owner)\s+is\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
-            
-            # Operated by patterns
-            r"(?:is\s+owned\s+and\s+operated\s+by|trading\s+as|t/a|operated\s+by)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
-            
-            # Developed by patterns
-            r"(?:developed|powered)\s+by\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
-            
-            # Footer company with All rights reserved
-            r"([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))(?:\s+All\s+[Rr]ights\s+[Rr]eserved)",
-            
-            # Contact us / about us section company names
-            r"(?:Contact|About)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
-            
-            # Company with registered address
-            r"([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))(?:\s+is\s+registered\s+at)",
-            
-            # Company with registration number
-            r"(?:Company\s+Registration\s+(?:Number|No)\.?:?\s+\d+\s*[-–]\s*([A-Z][a-zA-Z0-9\s\&\-'.,]+))",
-            r"([A-Z][a-zA-Z0-9\s\&\-'.,]+)(?:\s+Company\s+Registration\s+(?:Number|No)\.?:?\s+\d+)",
-            
-            # Company with VAT number
-            r"(?:VAT\s+(?:Number|No)\.?:?\s+\d+\s*[-–]\s*([A-Z][a-zA-Z0-9\s\&\-'.,]+))",
-            r"([A-Z][a-zA-Z0-9\s\&\-'.,]+)(?:\s+VAT\s+(?:Number|No)\.?:?\s+\d+)",
-            
-            # Simple company name in footer (less reliable)
-            r"<footer[^>]*>.*?([A-Z][a-zA-Z0-9\s\&\-'.,]{2,50}(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.)).*?</footer>",
-            
-            # Company names in meta tags
-            r'<meta\s+name=["\']author["\'][^>]*content=["\']([A-Z][a-zA-Z0-9\s\&\-\'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))["\'"][^>]*>',
-            r'<meta\s+property=["\']og:site_name["\'][^>]*content=["\']([A-Z][a-zA-Z0-9\s\&\-\'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))["\'"][^>]*>',
-            
-            # Company name in typical about page phrases
-            r"(?:was\s+founded\s+(?:in|by))\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
-            r"(?:welcome\s+to)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))"
-        ]
+        self.company_patterns = _COMPANY_PATTERNS
+        self.company_pattern_tiers = _COMPANY_PATTERN_TIERS
         
         # Common phrases to remove from extracted company names
         self.cleanup_phrases = [
@@ -89,63 +324,180 @@ class CompanyNameExtractor:
             "Website",
         ]
         
+        # All cleanup phrases in a single alternation so they are removed in one pass
+        self._cleanup_re = re.compile('|'.join(re.escape(phrase) for phrase in self.cleanup_phrases), re.IGNORECASE)
+        
         # Patterns for finding privacy policy URLs
-        self.privacy_policy_patterns = [
-            r'<a[^>]*href="([^"]*privacy[^"]*)"[^>]*>',
-            r'<a[^>]*href="([^"]*policy[^"]*)"[^>]*>',
-            r'<a[^>]*href="([^"]*terms[^"]*)"[^>]*>',
-            r'<a[^>]*href="([^"]*imprint[^"]*)"[^>]*>',
-            r'<a[^>]*href="([^"]*impressum[^"]*)"[^>]*>',
-            r'<a[^>]*href="([^"]*legal[^"]*)"[^>]*>'
-        ]
+        self.privacy_policy_patterns = _PRIVACY_POLICY_PATTERNS
+        
+        # Shared session so the homepage and policy pages reuse pooled connections
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Connection': 'keep-alive'
+        })
+        # Only retry transient failures; unreachable hosts fail fast
+        retry = Retry(
+            total=max_retries,
+            connect=0,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
-    def fetch_url(self, url, max_retries=3, timeout=10):
+    def fetch_url(self, url, timeout=10):
         """
-        Fetch content from a URL with error handling and retries
+        Fetch content from a URL with error handling
+        
+        Retries of 5xx responses and read errors are handled by the session's
+        adapter with exponential backoff; other failures return immediately.
         
         Args:
             url: The URL to fetch
-            max_retries: Number of retry attempts
             timeout: Timeout in seconds
-            
+        
         Returns:
             HTML content or None if failed
         """
-        # User agent to mimic a browser
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml',
-            'Accept-Language': 'en-US,en;q=0.9'
-        }
-        
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"Fetching {url} (attempt {attempt+1}/{max_retries})")
-                response = requests.get(url, headers=headers, timeout=timeout)
-                
-                if response.status_code == 200:
-                    return response.text
-                elif response.status_code == 403:
-                    logger.warning(f"Access forbidden (403) for {url}")
-                    return None
-                elif response.status_code == 404:
-                    logger.warning(f"Page not found (404) for {url}")
-                    return None
-                else:
-                    logger.warning(f"Failed to fetch {url} - Status code: {response.status_code}")
+        try:
+            logger.info(f"Fetching {url}")
+            response = self.session.get(url, timeout=timeout)
             
-            except requests.exceptions.ConnectionError:
-                logger.warning(f"Connection error for {url}")
-            except requests.exceptions.Timeout:
-                logger.warning(f"Timeout error for {url}")
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Error fetching {url}: {str(e)}")
-            
-            # Add delay before retry
-            time.sleep(random.uniform(1, 3))
+            if response.status_code == 200:
+                return self._decode_body(response)
+            elif response.status_code == 403:
+                logger.warning(f"Access forbidden (403) for {url}")
+            elif response.status_code == 404:
+                logger.warning(f"Page not found (404) for {url}")
+            else:
+                logger.warning(f"Failed to fetch {url} - Status code: {response.status_code}")
+        
+        except requests.exceptions.ConnectionError:
+            logger.warning(f"Connection error for {url}")
+        except requests.exceptions.Timeout:
+            logger.warning(f"Timeout error for {url}")
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Error fetching {url}: {str(e)}")
         
         return None
     
+    def _decode_body(self, response):
+        """
+        Decode a response body once using its declared encoding
+        
+        Unlike response.text this never runs charset detection over the body.
+        
+        Args:
+            response: A requests response
+        
+        Returns:
+            Decoded HTML content
+        """
+        try:
+            return response.content.decode(response.encoding or 'utf-8', errors='replace')
+        except LookupError:
+            # Unknown charset name in the Content-Type header
+            return response.content.decode('utf-8', errors='replace')
+    
+    def probe_url(self, url, timeout=5):
+        """
+        Check a URL with a HEAD request, without downloading the body
+        
+        Args:
+            url: The URL to probe
+            timeout: Timeout in seconds
+        
+        Returns:
+            Tuple of (final URL after redirects or None, whether the host answered at all)
+        """
+        try:
+            response = self.session.head(url, timeout=timeout, allow_redirects=True)
+        except requests.exceptions.RequestException as e:
+            logger.info(f"Probe failed for {url}: {str(e)}")
+            return None, False
+        
+        if 200 <= response.status_code < 300:
+            return response.url, True
+        
+        # Some servers reject HEAD (e.g. 405) but still serve GET
+        return None, True
+    
+    def _map_in_order(self, func, items, max_workers):
+        """
+        Run func over items concurrently, yielding results in the original order
+        
+        Pending calls are cancelled as soon as the caller stops iterating,
+        so breaking out after the first useful result avoids the remaining work.
+        
+        Args:
+            func: Callable taking a single item
+            items: The items to process
+            max_workers: Maximum number of concurrent calls
+        
+        Yields:
+            Tuples of (item, result)
+        """
+        if not items:
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+        try:
+            futures = [(item, executor.submit(func, item)) for item in items]
+            for item, future in futures:
+                yield item, future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def fetch_urls(self, urls, max_workers=MAX_POLICY_WORKERS):
+        """
+        Fetch several URLs concurrently, yielding results in the original order
+        
+        Args:
+            urls: The URLs to fetch
+            max_workers: Maximum number of concurrent requests
+        
+        Yields:
+            Tuples of (url, HTML content or None)
+        """
+        return self._map_in_order(self.fetch_url, urls, max_workers)
+    
+    def fetch_homepage(self, urls):
+        """
+        Fetch the first working homepage among several URL variants
+        
+        The variants are probed with concurrent HEAD requests and only the first
+        one that answers with a 2xx is downloaded, using its post-redirect URL.
+        Variants whose host answered but rejected HEAD are then tried with GET.
+        
+        Args:
+            urls: URL variants in order of preference
+        
+        Returns:
+            Tuple of (homepage URL, HTML content), or (None, None) if none worked
+        """
+        reachable = []
+        
+        for url, (final_url, answered) in self._map_in_order(self.probe_url, urls, MAX_VARIANT_WORKERS):
+            if final_url:
+                content = self.fetch_url(final_url)
+                if content:
+                    return final_url, content
+            elif answered:
+                reachable.append(url)
+        
+        # Fall back to plain GETs for hosts that answered the probe
+        for url, content in self.fetch_urls(reachable, max_workers=MAX_VARIANT_WORKERS):
+            if content:
+                return url, content
+        
+        return None, None
+    
     def normalize_url(self, base_url, relative_url):
         """
         Convert a relative URL to an absolute URL
@@ -153,26 +505,12 @@ class CompanyNameExtractor:
         Args:
             base_url: The base URL of the website
             relative_url: The relative URL to normalize
-            
+        
         Returns:
             Absolute URL
         """
-        if relative_url.startswith(('http://', 'https://')):
-            return relative_url
-        
-        # Split base URL, removing query string and fragments
-        base_parts = base_url.split('#')[0].split('?')[0]
-        
-        if relative_url.startswith('/'):
-            # Remove trailing slash from base if present
-            if base_parts.endswith('/'):
-                base_parts = base_parts[:-1]
-            return base_parts + relative_url
-        else:
-            # Ensure base ends with slash
-            if not base_parts.endswith('/'):
-                base_parts += '/'
-            return base_parts + relative_url
+        # Resolves '../', protocol-relative and query/fragment cases per RFC 3986
+        return urljoin(base_url, relative_url)
     
     def find_privacy_policy_url(self, base_url, homepage_content):
         """
@@ -181,21 +519,25 @@ class CompanyNameExtractor:
         Args:
             base_url: Base URL of the website
             homepage_content: HTML content of the homepage
-            
+        
         Returns:
             List of discovered privacy policy URLs
         """
         policy_urls = []
+        seen = set()
         
         # Extract potential policy URLs using regex patterns
         for pattern in self.privacy_policy_patterns:
-            matches = re.finditer(pattern, homepage_content, re.IGNORECASE)
+            matches = pattern.finditer(homepage_content)
             for match in matches:
                 try:
                     href = match.group(1)
                     # Normalize URL
                     url = self.normalize_url(base_url, href)
-                    policy_urls.append(url)
+                    # Several patterns can match the same link
+                    if url not in seen:
+                        seen.add(url)
+                        policy_urls.append(url)
                 except:
                     continue
         
@@ -214,7 +556,8 @@ class CompanyNameExtractor:
         
         for path in common_policy_paths:
             url = self.normalize_url(base_url, path)
-            if url not in policy_urls:
+            if url not in seen:
+                seen.add(url)
                 policy_urls.append(url)
         
         return policy_urls
@@ -225,65 +568,198 @@ class CompanyNameExtractor:
         
         Args:
             html_content: Raw HTML content
-            
+        
         Returns:
             Extracted plain text
         """
         if not html_content:
             return ""
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        tree = LexborHTMLParser(html_content)
         
         # Remove script and style elements
-        for element in soup(['script', 'style', 'head', 'nav']):
+        for element in tree.css('script, style, head, nav'):
             element.decompose()
         
         # Get text
-        text = soup.get_text(separator=' ')
+        root = tree.body if tree.body is not None else tree.root
+        text = root.text(separator=' ') if root is not None else ""
         
         # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         
         return text
     
-    def extract_company_name_from_text(self, text):
+    def extract_company_name_from_html(self, html_content):
+        """
+        Extract company name from the regions of raw HTML where it usually appears
+        
+        Meta tags and footers are read from the parsed DOM; the text patterns run
+        over the footer markup and the tail of the rest of the document only, so
+        each footer is scanned once.
+        
+        Args:
+            html_content: Raw HTML content
+        
+        Returns:
+            Extracted company name or None
+        """
+        if not html_content:
+            return None
+        
+        tree = LexborHTMLParser(html_content)
+        dom_candidates = {}
+        
+        # Author/site-name meta tags
+        for meta in tree.css('meta[name="author"], meta[property="og:site_name"]'):
+            content = (meta.attributes.get('content') or '').strip()
+            if _META_COMPANY_RE.fullmatch(content):
+                dom_candidates.setdefault(_META_TIER, []).append(content)
+        
+        # First company name in each footer; a nested footer's text is already part of its parent's
+        footers = [footer for footer in tree.css('footer') if not _inside_footer(footer)]
+        for footer in footers:
+            match = _FOOTER_COMPANY_RE.search(footer.text(separator='\n'))
+            if match:
+                dom_candidates.setdefault(_FOOTER_TIER, []).append(match.group(0))
+        
+        chunks = [footer.html for footer in footers]
+        
+        # Copyright lines outside a <footer> element are usually near the end; the footers
+        # are removed first so the tail doesn't scan (and vote for) them a second time
+        for footer in footers:
+            footer.decompose()
+        chunks.append((tree.html or '')[-TAIL_SCAN_CHARS:])
+        
+        return self.extract_company_name_from_text('\n'.join(chunks), dom_candidates)
+    
+    def extract_relevant_text(self, html_content):
+        """
+        Extract text only from the page regions company names appear in
+        
+        Rather than stripping scripts and styles from the whole document, this
+        whitelists footers, legal/copyright blocks, paragraphs, list items,
+        headings and the author/site-name meta tags.
+        
+        Args:
+            html_content: Raw HTML content
+        
+        Returns:
+            Extracted plain text
+        """
+        if not html_content:
+            return ""
+        
+        tree = LexborHTMLParser(html_content)
+        nodes = tree.css(_RELEVANT_TEXT_SELECTOR)
+        selected = {node.mem_id for node in nodes}
+        
+        chunks = []
+        for node in nodes:
+            if node.tag == 'meta':
+                content = node.attributes.get('content')
+                if content:
+                    chunks.append(content)
+                continue
+            
+            # Skip nodes nested in another selected node so text is not counted twice
+            parent = node.parent
+            while parent is not None and parent.mem_id not in selected:
+                parent = parent.parent
+            if parent is not None:
+                continue
+            
+            chunks.append(node.text(separator=' '))
+        
+        # Normalize whitespace
+        return _WHITESPACE_RE.sub(' ', ' '.join(chunks)).strip()
+    
+    def _matching_pattern_ids(self, text):
+        """
+        Cheaply work out which company patterns can match a text
+        
+        Uses a single Hyperscan pass when available; otherwise patterns that
+        need a legal suffix are ruled out when the text contains none.
+        
+        Args:
+            text: Text about to be scanned
+        
+        Returns:
+            Set of pattern indices, or None if every pattern has to be tried
+        """
+        if _HYPERSCAN_DB is not None:
+            scratch = getattr(_hyperscan_local, 'scratch', None)
+            if scratch is None:
+                scratch = _hyperscan_local.scratch = hyperscan.Scratch(_HYPERSCAN_DB)
+            
+            matched = set()
+            
+            def on_match(pattern_id, start, end, flags, context):
+                matched.add(pattern_id)
+            
+            _HYPERSCAN_DB.scan(text.encode('utf-8', errors='replace'), match_event_handler=on_match, scratch=scratch)
+            return matched
+        
+        if _LEGAL_SUFFIX_RE.search(text) is None:
+            return _SUFFIXLESS_PATTERN_IDS
+        
+        return None
+    
+    def extract_company_name_from_text(self, text, dom_candidates=None):
         """
         Extract company name from plain text using regex patterns
         
         Args:
             text: Plain text to analyze
-            
+            dom_candidates: Optional mapping of tier to candidates already found in the DOM
+        
         Returns:
             Extracted company name or None
         """
-        if not text:
+        if not text and not dom_candidates:
             return None
         
+        text = text or ""
+        dom_candidates = dom_candidates or {}
+        
+        # Bound the regex work on very large documents
+        text = text[:MAX_SCAN_CHARS]
+        
         candidates = []
         
-        # Try each pattern to find company names
-        for pattern in self.company_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                try:
-                    company = match.group(1).strip()
-                    # Validate with basic rules
-                    if self._validate_company_name(company):
-                        candidates.append(company)
-                except:
-                    continue
+        # Only run the patterns that can possibly match this text
+        allowed_ids = self._matching_pattern_ids(text)
+        
+        # Scan tier by tier, stopping at the first tier that yields a valid candidate
+        for tier, pattern_ids in self.company_pattern_tiers:
+            if allowed_ids is not None:
+                pattern_ids = tuple(i for i in pattern_ids if i in allowed_ids)
+            
+            if pattern_ids:
+                pattern = _fused_company_pattern(pattern_ids)
+                for match in pattern.finditer(text):
+                    try:
+                        company = match.group(match.lastindex + 1).strip()
+                        # Validate with basic rules
+                        if self._validate_company_name(company):
+                            candidates.append(company)
+                    except:
+                        continue
+            
+            for company in dom_candidates.get(tier, ()):
+                if self._validate_company_name(company):
+                    candidates.append(company)
+            
+            if candidates:
+                break
         
         # Consider frequency of mentions
         if candidates:
-            counts = {}
-            for candidate in candidates:
-                # Normalize candidate for counting
-                norm_candidate = self._normalize_company_name(candidate)
-                counts[norm_candidate] = counts.get(norm_candidate, 0) + 1
+            # Normalize candidates for counting
+            counts = Counter(self._normalize_company_name(candidate) for candidate in candidates)
             
             # Get most frequently mentioned company name
-            sorted_candidates = sorted(counts.items(), key=lambda x: x[1], reverse=True)
-            best_candidate = sorted_candidates[0][0]
+            best_candidate = counts.most_common(1)[0][0]
             
             # Clean up the company name
             clean_name = self._clean_company_name(best_candidate)
@@ -298,35 +774,11 @@ class CompanyNameExtractor:
         
         Args:
             name: Company name to validate
-            
+        
         Returns:
             True if valid, False otherwise
         """
-        # Must be at least 3 characters
-        if not name or len(name) < 3:
-            return False
-        
-        # Must contain at least one letter
-        if not any(c.isalpha() for c in name):
-            return False
-        
-        # Check for suspicious patterns indicating false positive
-        suspicious = [
-            "all rights reserved",
-            "privacy policy",
-            "terms of service",
-            "cookie policy",
-            "sitemap",
-            "contact us",
-            "about us"
-        ]
-        
-        lower_name = name.lower()
-        for pattern in suspicious:
-            if pattern in lower_name and len(name) < 30:  # Short matches likely false positives
-                return False
-        
-        return True
+        return validate_company_name(name)
     
     def _normalize_company_name(self, name):
         """
@@ -334,33 +786,11 @@ class CompanyNameExtractor:
         
         Args:
             name: Company name to normalize
-            
+        
         Returns:
             Normalized company name
         """
-        if not name:
-            return ""
-        
-        # Convert to lowercase
-        normalized = name.lower()
-        
-        # Remove common legal entity types for comparison
-        legal_suffixes = [
-            "ltd", "limited", "llc", "inc", "corp", "corporation",
-            "gmbh", "b.v.", "pty ltd", "s.a.", "co."
-        ]
-        
-        for suffix in legal_suffixes:
-            if normalized.endswith(suffix):
-                normalized = normalized[:-len(suffix)].strip()
-        
-        # Remove punctuation
-        normalized = re.sub(r'[^\w\s]', '', normalized)
-        
-        # Normalize whitespace
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        return normalized
+        return normalize_company_name(name)
     
     def _clean_company_name(self, name):
         """
@@ -368,7 +798,7 @@ class CompanyNameExtractor:
         
         Args:
             name: Raw company name
-            
+        
         Returns:
             Cleaned company name
         """
@@ -376,21 +806,19 @@ class CompanyNameExtractor:
             return None
         
         # Remove HTML tags
-        cleaned = re.sub(r'<[^>]+>', '', name)
+        cleaned = _HTML_TAG_RE.sub('', name)
         
         # Remove extra whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
         
         # Remove common phrases that aren't part of company names
-        for phrase in self.cleanup_phrases:
-            pattern = re.compile(re.escape(phrase), re.IGNORECASE)
-            cleaned = pattern.sub('', cleaned)
+        cleaned = self._cleanup_re.sub('', cleaned)
         
         # Remove trailing punctuation
         cleaned = cleaned.rstrip('.,;:')
         
         # Remove extra whitespace again after cleanup
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
         
         return cleaned
     
@@ -398,9 +826,42 @@ class CompanyNameExtractor:
         """
         Main method to extract company name from a domain
         
+        Successfully analyzed domains are served from an LRU cache on repeat calls.
+        
         Args:
             domain: Domain to analyze
-            
+        
+        Returns:
+            Dictionary with domain, status and company name
+        """
+        key = domain.strip().lower()
+        
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                logger.info(f"Using cached result for domain: {domain}")
+                return dict(cached)
+        
+        result = self._extract_company_name_uncached(domain)
+        
+        # Errors are not cached so the domain is retried next time
+        if result["status"] == "analyzed" and self.cache_size > 0:
+            with self._cache_lock:
+                self._cache[key] = dict(result)
+                self._cache.move_to_end(key)
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        
+        return result
+    
+    def _extract_company_name_uncached(self, domain):
+        """
+        Fetch and analyze a domain without consulting the cache
+        
+        Args:
+            domain: Domain to analyze
+        
         Returns:
             Dictionary with domain, status and company name
         """
@@ -423,16 +884,8 @@ class CompanyNameExtractor:
         # Filter out None values
         urls = [url for url in urls if url]
         
-        # Try to fetch homepage
-        homepage_url = None
-        homepage_content = None
-        
-        for url in urls:
-            content = self.fetch_url(url)
-            if content:
-                homepage_url = url
-                homepage_content = content
-                break
+        # Try to fetch homepage; the earliest working variant in the list wins
+        homepage_url, homepage_content = self.fetch_homepage(urls)
         
         if not homepage_url or not homepage_content:
             logger.warning(f"Could not access domain: {domain}")
@@ -440,7 +893,7 @@ class CompanyNameExtractor:
             return result
         
         # First try to find company name in homepage
-        company_name = self.extract_company_name_from_text(homepage_content)
+        company_name = self.extract_company_name_from_html(homepage_content)
         
         # If found on homepage, return it
         if company_name:
@@ -451,18 +904,17 @@ class CompanyNameExtractor:
         # Otherwise, try to find privacy policy or terms pages
         policy_urls = self.find_privacy_policy_url(homepage_url, homepage_content)
         
-        # Check each policy URL
-        for url in policy_urls:
+        # Check each policy URL, downloading ahead while earlier pages are analyzed
+        for url, content in self.fetch_urls(policy_urls):
             logger.info(f"Checking policy URL: {url}")
-            content = self.fetch_url(url)
             
             if content:
-                # First try with HTML content (for patterns targeting HTML structure)
-                company_name = self.extract_company_name_from_text(content)
+                # First try with the footer/meta regions of the HTML
+                company_name = self.extract_company_name_from_html(content)
                 
                 # If not found, try with plain text
                 if not company_name:
-                    text = self.extract_text_from_html(content)
+                    text = self.extract_relevant_text(content)
                     company_name = self.extract_company_name_from_text(text)
                 
                 if company_name:
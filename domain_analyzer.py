@@ -1,86 +1,65 @@
-import requests
-import re
-import time
-import random
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from company_name_extractor import CompanyNameExtractor
+
+# Number of domains analyzed concurrently by analyze_domains
+MAX_DOMAIN_WORKERS = 20
+
+# Concurrent analyses allowed against a single host
+MAX_ANALYSES_PER_HOST = 2
 
 class DomainAnalyzer:
     """
     Simple domain analyzer that extracts company information from websites
+    
+    Keeps its homepage-only API, but delegates fetching and pattern matching to a
+    CompanyNameExtractor so both entry points share the same compiled patterns and
+    HTTP session.
     """
     
-    def __init__(self):
-        # Simple regex patterns for company names
-        self.company_patterns = [
-            # Copyright patterns
-            r"(?:\u00a9|copyright|\(c\))\s*(?:20\d{2}(?:-20\d{2})?)\s+([A-Z][a-zA-Z0-9\s\&\-']+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
-            # Just copyright year and name
-            r"(?:\u00a9|copyright|\(c\))\s*(?:20\d{2}(?:-20\d{2})?)\s+([A-Z][a-zA-Z0-9\s\&\-']+)",
-            # Operated by patterns
-            r"(?:is\s+owned\s+and\s+operated\s+by|trading\s+as|t/a|operated\s+by)\s+([A-Z][a-zA-Z0-9\s\&\-']+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
-            # Footer company with All rights reserved
-            r"([A-Z][a-zA-Z0-9\s\&\-']+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))(?:\s+All\s+[Rr]ights\s+[Rr]eserved)"
-        ]
+    def __init__(self, extractor=None):
+        self.extractor = extractor or CompanyNameExtractor()
+        
+        # Per-host throttles so different hosts run in parallel but one host isn't hammered
+        self._host_semaphores = defaultdict(lambda: threading.Semaphore(MAX_ANALYSES_PER_HOST))
+        self._host_semaphores_lock = threading.Lock()
     
     def fetch_homepage(self, domain):
         """Fetch the homepage content of a domain"""
-        try:
-            # Try different URL formats
-            urls = [
-                f"https://{domain}",
-                f"http://{domain}",
-                f"https://www.{domain}" if not domain.startswith('www.') else None,
-                f"http://www.{domain}" if not domain.startswith('www.') else None
-            ]
-            
-            # Filter out None values
-            urls = [url for url in urls if url]
-            
-            for url in urls:
-                try:
-                    print(f"  Trying {url}")
-                    response = requests.get(url, timeout=10)
-                    if response.status_code == 200:
-                        print(f"  Success with {url}")
-                        return response.text
-                except Exception as e:
-                    print(f"  Error with {url}: {str(e)}")
-                    continue
-            
-            return None
-        except Exception as e:
-            print(f"Error fetching {domain}: {str(e)}")
-            return None
+        # Try different URL formats
+        urls = [
+            f"https://{domain}",
+            f"http://{domain}",
+            f"https://www.{domain}" if not domain.startswith('www.') else None,
+            f"http://www.{domain}" if not domain.startswith('www.') else None
+        ]
+        
+        # Filter out None values
+        urls = [url for url in urls if url]
+        
+        _, content = self.extractor.fetch_homepage(urls)
+        return content
     
     def extract_company_name(self, text):
-        """Extract company name from text using simple patterns"""
+        """Extract company name from homepage content using the extractor's patterns"""
         if not text:
             return None
         
-        candidates = []
-        
-        for pattern in self.company_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                try:
-                    company = match.group(1).strip()
-                    # Validate: Must be at least 3 chars and contain a letter
-                    if len(company) >= 3 and any(c.isalpha() for c in company):
-                        candidates.append(company)
-                except:
-                    continue
-        
-        # If we found multiple candidates, take the most common one
-        if candidates:
-            # Count occurrences
-            counts = {}
-            for candidate in candidates:
-                counts[candidate] = counts.get(candidate, 0) + 1
-            
-            # Sort by count and return the most common
-            sorted_candidates = sorted(counts.items(), key=lambda x: x[1], reverse=True)
-            return sorted_candidates[0][0]
-        
-        return None
+        return self.extractor.extract_company_name_from_html(text)
+    
+    def _host_semaphore(self, domain):
+        """Get the throttle shared by all analyses of a host"""
+        host = domain.strip().lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        with self._host_semaphores_lock:
+            return self._host_semaphores[host]
+    
+    def _analyze_throttled(self, domain):
+        """Analyze a domain while holding its host's throttle"""
+        with self._host_semaphore(domain):
+            return self.analyze_domain(domain)
     
     def analyze_domain(self, domain):
         """Analyze a single domain and extract company name"""
@@ -109,17 +88,13 @@ class DomainAnalyzer:
         print(f"  Results for {domain}: Company name: {company_name}")
         return result
     
-    def analyze_domains(self, domains):
-        """Analyze multiple domains and compile results"""
-        results = []
-        
-        for domain in domains:
-            result = self.analyze_domain(domain)
-            results.append(result)
-            # Be nice to servers - add a random delay
-            time.sleep(random.uniform(1, 3))
+    def analyze_domains(self, domains, max_workers=MAX_DOMAIN_WORKERS):
+        """Analyze multiple domains concurrently and compile results in input order"""
+        if not domains:
+            return []
         
-        return results
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(domains))) as executor:
+            return list(executor.map(self._analyze_throttled, domains))
 
 # Example usage
 if __name__ == "__main__":
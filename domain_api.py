@@ -1,15 +1,24 @@
 """
 Simple API for domain analysis
 """
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 import os
 import logging
-import traceback
+import logging.handlers
+import queue
+import atexit
 import sys
 from mock_db import MockDatabase
 from datetime import datetime
 from simplified_analyzer import SimplifiedAnalyzer
 
+# Optional faster JSON encoder for API responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -17,7 +26,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Handlers that actually write log output; request threads only enqueue records for them
+_log_handlers = logging.getLogger().handlers[:]
+_log_listener = None
+
+def _start_log_listener():
+    """Route root logging through a queue drained by a background thread"""
+    global _log_listener
+    log_queue = queue.Queue(-1)
+    _log_listener = logging.handlers.QueueListener(log_queue, *_log_handlers, respect_handler_level=True)
+    logging.getLogger().handlers = [logging.handlers.QueueHandler(log_queue)]
+    _log_listener.start()
+
+def _stop_log_listener():
+    """Flush queued log records on shutdown"""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+_start_log_listener()
+atexit.register(_stop_log_listener)
+# Listener threads don't survive fork (gunicorn --preload), so start a fresh one in each worker
+os.register_at_fork(after_in_child=_start_log_listener)
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            # Hand dates to Flask's default so they keep its HTTP-date format instead of RFC 3339
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        ).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
 # Use in-memory database
 db = MockDatabase(use_memory=True)
 # Initialize analyzer
@@ -47,8 +94,7 @@ def domains():
             logger.info(f"Found {len(domains)} domains")
             return jsonify(domains)
         except Exception as e:
-            logger.error(f"Error retrieving domains: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error retrieving domains: {str(e)}")
             return jsonify({"error": "Failed to retrieve domains"}), 500
     
     elif request.method == 'POST':
@@ -72,8 +118,7 @@ def domains():
                 logger.warning(f"Domain {domain} already exists")
                 return jsonify({"error": f"Domain {domain} already exists"}), 409
         except Exception as e:
-            logger.error(f"Error adding domain: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error adding domain: {str(e)}")
             return jsonify({"error": "Failed to add domain"}), 500
 
 @app.route('/api/domains/<domain>', methods=['GET', 'PUT', 'DELETE'])
@@ -92,8 +137,7 @@ def domain_detail(domain):
                 logger.warning(f"Domain {domain} not found")
                 return jsonify({"error": f"Domain {domain} not found"}), 404
         except Exception as e:
-            logger.error(f"Error retrieving domain {domain}: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error retrieving domain {domain}: {str(e)}")
             return jsonify({"error": "Failed to retrieve domain"}), 500
     
     elif request.method == 'PUT':
@@ -109,6 +153,9 @@ def domain_detail(domain):
             
             success = db.update_domain(domain, status, company_name, contact_url)
             
+            # Manual edits supersede any cached analysis
+            analyzer.invalidate_cache(domain)
+            
             if success:
                 logger.info(f"Domain {domain} updated successfully")
                 return jsonify({"message": f"Domain {domain} updated successfully"})
@@ -116,8 +163,7 @@ def domain_detail(domain):
                 logger.warning(f"Domain {domain} not found")
                 return jsonify({"error": f"Domain {domain} not found"}), 404
         except Exception as e:
-            logger.error(f"Error updating domain {domain}: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error updating domain {domain}: {str(e)}")
             return jsonify({"error": "Failed to update domain"}), 500
     
     elif request.method == 'DELETE':
@@ -125,6 +171,7 @@ def domain_detail(domain):
         logger.info(f"DELETE /api/domains/{domain}")
         try:
             success = db.delete_domain(domain)
+            analyzer.invalidate_cache(domain)
             
             if success:
                 logger.info(f"Domain {domain} deleted successfully")
@@ -133,8 +180,7 @@ def domain_detail(domain):
                 logger.warning(f"Domain {domain} not found")
                 return jsonify({"error": f"Domain {domain} not found"}), 404
         except Exception as e:
-            logger.error(f"Error deleting domain {domain}: {str(e)}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error deleting domain {domain}: {str(e)}")
             return jsonify({"error": "Failed to delete domain"}), 500
 
 @app.route('/api/update-all', methods=['GET'])
@@ -147,39 +193,27 @@ def update_all_domains():
         domains = db.get_all_domains()
         logger.info(f"Found {len(domains)} domains")
         
-        updated_count = 0
-        
-        # Update each domain
-        for domain_data in domains:
-            domain = domain_data["domain"]
-            company_name = f"Company for {domain} (via API)"
-            contact_url = f"https://{domain}/contact"
-            
-            logger.info(f"Updating {domain} with company: {company_name}")
-            
-            # Update domain
-            success = db.update_domain(
-                domain=domain,
-                status="analyzed",
-                company_name=company_name,
-                contact_url=contact_url
-            )
-            
-            if success:
-                updated_count += 1
+        # Build all updates and apply them in one batch
+        updates = [
+            {
+                "domain": d["domain"],
+                "status": "analyzed",
+                "company_name": f"Company for {d['domain']} (via API)",
+                "contact_url": f"https://{d['domain']}/contact"
+            }
+            for d in domains
+        ]
+        updated_domains = db.bulk_update_domains(updates)
         
-        # Verify updates
-        updated_domains = db.get_all_domains()
         result = {
-            "message": f"Successfully updated {updated_count} domains",
+            "message": f"Successfully updated {len(updated_domains)} domains",
             "domains": updated_domains
         }
         
         return jsonify(result)
-        
+    
     except Exception as e:
-        logger.error(f"Error updating domains: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error updating domains: {str(e)}")
         return jsonify({"error": "Failed to update domains"}), 500
 
 @app.route('/api/analyze/<domain>', methods=['GET'])
@@ -210,10 +244,9 @@ def analyze_domain_real(domain):
         else:
             logger.error(f"Failed to update domain {domain} after analysis")
             return jsonify({"error": "Failed to update domain after analysis"}), 500
-            
+    
     except Exception as e:
-        logger.error(f"Error analyzing domain {domain}: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error analyzing domain {domain}: {str(e)}")
         return jsonify({
             "error": "Failed to analyze domain",
             "details": str(e)
@@ -251,19 +284,21 @@ def analyze_all_domains_real():
             "message": f"Successfully analyzed {updated_count} domains",
             "results": results
         })
-        
+    
     except Exception as e:
-        logger.error(f"Error analyzing domains: {str(e)}")
-        logger.error(traceback.format_exc())
+        logger.exception(f"Error analyzing domains: {str(e)}")
         return jsonify({
             "error": "Failed to analyze domains",
             "details": str(e)
         }), 500
 
+# Health check body is constant, so it is encoded once rather than per probe
+_HEALTH_BODY = b'{"status":"healthy"}\n'
+
 @app.route('/healthz', methods=['GET'])
 def healthcheck():
     """Simple health check endpoint"""
-    return jsonify({"status": "healthy"}), 200
+    return Response(_HEALTH_BODY, status=200, mimetype='application/json')
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
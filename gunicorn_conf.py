@@ -0,0 +1,20 @@
+"""
+Gunicorn settings for the web process
+"""
+import os
+
+# Patch blocking stdlib I/O before --preload imports the app (and requests)
+from gevent import monkey
+monkey.patch_all()
+
+# Greenlet workers so long /api/analyze-all calls don't block health checks
+worker_class = 'gevent'
+worker_connections = 1000
+
+# The domain store is in memory and per process, so a single worker is the default
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+# Analyzing every domain can take a while
+timeout = 120
+
+preload_app = True
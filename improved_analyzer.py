@@ -2,19 +2,98 @@
 Improved domain analyzer with more sophisticated extraction techniques
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import time
-import random
-from bs4 import BeautifulSoup
+import functools
+import threading
+from collections import Counter, defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+from selectolax.lexbor import LexborHTMLParser
+
+# Optional SIMD multi-pattern prefilter
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Characters of body text scanned at each end of the page for company names
+BODY_SCAN_CHARS = 4096
+
+# Number of domains analyzed concurrently by analyze_domains
+MAX_DOMAIN_WORKERS = 16
+
+# Concurrent analyses allowed against a single host
+MAX_ANALYSES_PER_HOST = 2
+
+# Homepage URL variants probed (HEAD) concurrently per domain
+MAX_VARIANT_WORKERS = 6
+
+# Homepage bytes downloaded per request. Footers and contact links sit at the end of the
+# document, so a page over the cap loses them first; this is sized to hold nearly all
+# homepages whole while still bounding runaway responses
+MAX_CONTENT_BYTES = 2 * 1024 * 1024
+CHUNK_SIZE = 8192
+
+# Substrings every contact link candidate contains; pages without any are skipped
+CONTACT_KEYWORDS = ('contact', 'about', 'impressum', 'kontakt', 'imprint')
+
+# Pooled connections kept per host by the shared session
+POOL_CONNECTIONS = 50
+POOL_MAXSIZE = 50
+
+# Analyzed domains kept in the result cache, and for how long (seconds)
+DEFAULT_CACHE_SIZE = 10000
+DEFAULT_CACHE_TTL = 24 * 3600
+
+# Helpers for clean_company_name
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+# Common words that aren't part of company names
+_STOPWORD_RE = re.compile(
+    r'\b(?:home|contact|about|us|privacy|policy|terms|conditions|cookies|sitemap|menu)\b',
+    re.IGNORECASE
+)
+
+@functools.lru_cache(maxsize=4096)
+def clean_company_name(name):
+    """Clean up extracted company name (memoized, as the same line repeats across pages)"""
+    if not name:
+        return None
+    
+    # Remove HTML tags
+    name = _TAG_RE.sub('', name)
+    
+    # Remove extra whitespace
+    name = _WS_RE.sub(' ', name).strip()
+    
+    # Remove common words that aren't part of company names
+    name = _STOPWORD_RE.sub('', name)
+    
+    # Remove extra whitespace again after word removal
+    name = _WS_RE.sub(' ', name).strip()
+    
+    # Remove trailing punctuation
+    name = name.rstrip('.,;:')
+    
+    return name if len(name) >= 3 else None
 
 class ImprovedAnalyzer:
     """
     Improved version of the domain analyzer with better extraction capabilities
     """
     
-    def __init__(self):
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, cache_ttl=DEFAULT_CACHE_TTL):
+        # LRU cache of analyzed domains as (timestamp, result), most recently used last
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         # Regular expressions for extracting company names
-        self.company_patterns = [
+        company_patterns = [
             # Standard copyright patterns
             r"(?:©|copyright|\(c\))\s*(?:20\d{2}(?:-20\d{2})?)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
             # Just the copyright year and name without legal suffix
@@ -29,150 +108,347 @@ class ImprovedAnalyzer:
             r"(?:Contact|About)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
             # Company with registered address
             r"([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))(?:\s+is\s+registered\s+at)",
-            # Simple company name in footer (less reliable)
-            r"<footer[^>]*>.*?([A-Z][a-zA-Z0-9\s\&\-'.,]{2,50}(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.)).*?</footer>"
         ]
+        self._raw_company_patterns = company_patterns
+        # One alternation scans the text once; each pattern is wrapped in a named group p<i>
+        self._fused_patterns = {}
+        self.company_pattern = self._fused_company_pattern(tuple(range(len(company_patterns))))
+        
+        # With Hyperscan installed, one DFA pass decides which patterns need the re engine at all
+        self._hyperscan_db = self._build_hyperscan_database(company_patterns)
+        self._hyperscan_local = threading.local()
+        
+        # Simple company name in footer text (less reliable, only run over <footer> elements)
+        self.footer_company_pattern = re.compile(
+            r"([A-Z][a-zA-Z0-9\s\&\-'.,]{2,50}(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
+            re.IGNORECASE | re.DOTALL
+        )
+        
+        # URL variant that last served each domain's homepage, tried before racing the others
+        self._working_urls = OrderedDict()
+        self._working_urls_lock = threading.Lock()
+        
+        # Shared session so repeat requests to a host reuse pooled TCP/TLS connections
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        # Only retry transient failures; unreachable URL variants fail fast
+        retry = Retry(
+            total=2,
+            connect=0,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
-        # List of patterns for finding contact page URLs
-        self.contact_patterns = [
-            r'<a[^>]*href="([^"]*contact[^"]*)"[^>]*>',
-            r'<a[^>]*href="([^"]*about\-us[^"]*)"[^>]*>',
-            r'<a[^>]*href="([^"]*impressum[^"]*)"[^>]*>',  # German contact pages
-            r'<a[^>]*href="([^"]*kontakt[^"]*)"[^>]*>',    # German contact pages
-            r'<a[^>]*href="([^"]*imprint[^"]*)"[^>]*>',    # Another term for contact info
-            r'<a[^>]*href="([^"]*about[^"]*)"[^>]*>'       # About pages often have contact info
+        # Per-host throttles so different hosts run in parallel but one host isn't hammered
+        self._host_semaphores = defaultdict(lambda: threading.Semaphore(MAX_ANALYSES_PER_HOST))
+        self._host_semaphores_lock = threading.Lock()
+        
+        # Keywords identifying contact page links, in order of preference
+        contact_patterns = [
+            r'contact',
+            r'about\-us',
+            r'impressum',  # German contact pages
+            r'kontakt',    # German contact pages
+            r'imprint',    # Another term for contact info
+            r'about'       # About pages often have contact info
         ]
+        # Alternatives are tried in order at the start of the href, so lastindex is
+        # the (1-based) rank of the most preferred keyword found anywhere in it
+        self.contact_pattern = re.compile(
+            '|'.join(f'(?=.*?({p}))' for p in contact_patterns),
+            re.IGNORECASE | re.DOTALL
+        )
     
-    def fetch_url(self, url, timeout=10):
-        """Fetch content from a URL with error handling"""
+    def _fused_company_pattern(self, pattern_ids):
+        """Compile (once) the alternation of the given company patterns"""
+        pattern = self._fused_patterns.get(pattern_ids)
+        if pattern is None:
+            pattern = re.compile(
+                '|'.join(f'(?P<p{i}>{self._raw_company_patterns[i]})' for i in pattern_ids),
+                re.IGNORECASE | re.DOTALL
+            )
+            self._fused_patterns[pattern_ids] = pattern
+        return pattern
+    
+    def _build_hyperscan_database(self, patterns):
+        """Compile the company patterns into one Hyperscan database, or None if unavailable"""
+        if hyperscan is None:
+            return None
+        
+        flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_DOTALL | hyperscan.HS_FLAG_UTF8 |
+                 hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH)
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=timeout)
-            if response.status_code == 200:
-                return response.text
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[p.encode('utf-8') for p in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[flags] * len(patterns)
+            )
+        except hyperscan.error as e:
+            print(f"  Could not compile Hyperscan database, falling back to re: {str(e)}")
             return None
+        
+        return database
+    
+    def _company_pattern_for(self, text):
+        """Get the alternation of only the company patterns that can match text, or None"""
+        if self._hyperscan_db is None:
+            return self.company_pattern
+        
+        # Scratch space cannot be shared between concurrent scans
+        scratch = getattr(self._hyperscan_local, 'scratch', None)
+        if scratch is None:
+            scratch = self._hyperscan_local.scratch = hyperscan.Scratch(self._hyperscan_db)
+        
+        matched = set()
+        
+        def on_match(pattern_id, start, end, flags, context):
+            matched.add(pattern_id)
+        
+        self._hyperscan_db.scan(text.encode('utf-8', errors='replace'), match_event_handler=on_match, scratch=scratch)
+        if not matched:
+            return None
+        return self._fused_company_pattern(tuple(sorted(matched)))
+    
+    def fetch_page(self, url, timeout=10, etag=None, last_modified=None):
+        """Fetch up to MAX_CONTENT_BYTES of a URL, conditionally if validators are given; returns a page dict for 200/304 or None"""
+        try:
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            response = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+            try:
+                if response.status_code not in (200, 304):
+                    return None
+                
+                # Stop reading once the cap is reached; the rest of the body is never transferred
+                chunks = []
+                total = 0
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total >= MAX_CONTENT_BYTES:
+                        break
+                body = b''.join(chunks)[:MAX_CONTENT_BYTES]
+            finally:
+                response.close()
+            
+            try:
+                content = body.decode(response.encoding or 'utf-8', errors='replace')
+            except LookupError:
+                # Unknown charset name in the Content-Type header
+                content = body.decode('utf-8', errors='replace')
+            
+            return {
+                'url': url,
+                'status_code': response.status_code,
+                'content': content,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
         except Exception as e:
             print(f"  Error fetching {url}: {str(e)}")
             return None
     
+    def fetch_url(self, url, timeout=10):
+        """Fetch content from a URL with error handling"""
+        page = self.fetch_page(url, timeout=timeout)
+        if page is not None and page['status_code'] == 200:
+            return page['content']
+        return None
+    
+    def probe_url(self, url, timeout=5):
+        """Check a URL with a HEAD request; returns (final URL if it answered 2xx, whether the host answered at all)"""
+        try:
+            response = self.session.head(url, timeout=timeout, allow_redirects=True)
+        except requests.exceptions.RequestException as e:
+            print(f"  Probe failed for {url}: {str(e)}")
+            return None, False
+        
+        if 200 <= response.status_code < 300:
+            return response.url, True
+        
+        # Some servers reject HEAD (e.g. 405) but still serve GET
+        return None, True
+    
+    def _map_in_order(self, func, items, max_workers):
+        """Run func over items concurrently, yielding (item, result) in input order; pending calls are cancelled once the caller stops"""
+        if not items:
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+        try:
+            futures = [(item, executor.submit(func, item)) for item in items]
+            for item, future in futures:
+                yield item, future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _remember_working_url(self, domain, url):
+        """Record the URL variant that served a domain's homepage"""
+        key = domain.strip().lower()
+        with self._working_urls_lock:
+            self._working_urls[key] = url
+            self._working_urls.move_to_end(key)
+            if len(self._working_urls) > max(self.cache_size, 1):
+                self._working_urls.popitem(last=False)
+    
     def fetch_homepage(self, domain):
         """Try different URL variations to get the homepage content"""
-        urls = [
-            f"https://{domain}",
-            f"http://{domain}",
-            # If domain starts with www, try without it
-            f"https://{domain.replace('www.', '')}" if domain.startswith('www.') else None,
-            f"http://{domain.replace('www.', '')}" if domain.startswith('www.') else None,
-            # If domain doesn't start with www, try with it
-            f"https://www.{domain}" if not domain.startswith('www.') else None,
-            f"http://www.{domain}" if not domain.startswith('www.') else None
-        ]
+        key = domain.strip().lower()
+        with self._working_urls_lock:
+            working_url = self._working_urls.get(key)
+        
+        # Try the variant that worked last time on its own first
+        if working_url:
+            print(f"  Trying {working_url}")
+            page = self.fetch_page(working_url)
+            if page is not None and page['content']:
+                print(f"  Success with {working_url}")
+                return page
+            with self._working_urls_lock:
+                self._working_urls.pop(key, None)
+        
+        if domain.startswith('www.'):
+            # If domain starts with www, also try without it
+            bare = domain[4:]
+            urls = (f"https://{domain}", f"http://{domain}", f"https://{bare}", f"http://{bare}")
+        else:
+            # If domain doesn't start with www, also try with it
+            urls = (f"https://{domain}", f"http://{domain}", f"https://www.{domain}", f"http://www.{domain}")
         
-        # Filter out None values
-        urls = [url for url in urls if url]
+        # Skip the variant that just failed
+        if working_url:
+            urls = [url for url in urls if url != working_url]
         
-        for url in urls:
+        # Probe every variant with HEAD at once, but take them in preference order and download only one
+        reachable = []
+        for url, (final_url, answered) in self._map_in_order(self.probe_url, urls, MAX_VARIANT_WORKERS):
+            if final_url:
+                print(f"  Trying {final_url}")
+                page = self.fetch_page(final_url)
+                if page is not None and page['content']:
+                    print(f"  Success with {final_url}")
+                    self._remember_working_url(domain, final_url)
+                    return page
+            elif answered:
+                reachable.append(url)
+        
+        # Hosts that answered but rejected HEAD may still serve GET; try them one at a time, in order
+        for url in reachable:
             print(f"  Trying {url}")
-            content = self.fetch_url(url)
-            if content:
+            page = self.fetch_page(url)
+            if page is not None and page['content']:
                 print(f"  Success with {url}")
-                return {'url': url, 'content': content}
+                self._remember_working_url(domain, url)
+                return page
         
         return None
     
-    def extract_company_name(self, text):
-        """Extract company name from text using patterns"""
-        if not text:
+    @staticmethod
+    def _inside_footer(node):
+        """Whether a node has a <footer> ancestor"""
+        parent = node.parent
+        while parent is not None:
+            if parent.tag == 'footer':
+                return True
+            parent = parent.parent
+        return False
+    
+    def extract_company_name(self, content, tree=None):
+        """Extract company name from the footer and the start/end of the page text (removes scripts and footers from tree)"""
+        if not content:
             return None
         
+        if tree is None:
+            tree = LexborHTMLParser(content)
+        tree.strip_tags(['script', 'style', 'noscript'])
+        
+        # Outermost footers only; a nested footer's text is already part of its parent's
+        footers = [footer for footer in tree.css('footer') if not self._inside_footer(footer)]
+        footer_text = '\n'.join(footer.text(separator='\n') for footer in footers)
+        # Drop the footers so the body text doesn't scan (and vote for) their names a second time
+        for footer in footers:
+            footer.decompose()
+        body_text = tree.body.text(separator='\n') if tree.body else ''
+        if len(body_text) > 2 * BODY_SCAN_CHARS:
+            body_text = body_text[:BODY_SCAN_CHARS] + '\n' + body_text[-BODY_SCAN_CHARS:]
+        text = footer_text + '\n' + body_text
+        
         candidates = []
         
-        for pattern in self.company_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                try:
-                    company = match.group(1).strip()
-                    # Validate and clean
-                    company = self.clean_company_name(company)
-                    if company and len(company) >= 3 and any(c.isalpha() for c in company):
-                        candidates.append(company)
-                except Exception as e:
-                    print(f"  Error extracting company name: {str(e)}")
-                    continue
+        # Pair each match with its capture group: the one just inside the matched p<i> group
+        company_pattern = self._company_pattern_for(text)
+        matches = []
+        if company_pattern is not None:
+            matches = [(match, match.lastindex + 1) for match in company_pattern.finditer(text)]
+        # The loose footer pattern only adds names the patterns above didn't already capture there
+        taken = [match.span(group) for match, group in matches if match.start() < len(footer_text)]
+        for match in self.footer_company_pattern.finditer(footer_text):
+            start, end = match.span(1)
+            if not any(start < taken_end and taken_start < end for taken_start, taken_end in taken):
+                matches.append((match, 1))
+        for match, group in matches:
+            try:
+                company = match.group(group).strip()
+                # Validate and clean
+                company = self.clean_company_name(company)
+                if company and len(company) >= 3 and any(c.isalpha() for c in company):
+                    candidates.append(company)
+            except Exception as e:
+                print(f"  Error extracting company name: {str(e)}")
+                continue
         
         # If we found multiple candidates, take the most common one
         if candidates:
-            # Count occurrences
-            counts = {}
-            for candidate in candidates:
-                counts[candidate] = counts.get(candidate, 0) + 1
-            
-            # Sort by count and return the most common
-            sorted_candidates = sorted(counts.items(), key=lambda x: x[1], reverse=True)
-            return sorted_candidates[0][0]
+            return Counter(candidates).most_common(1)[0][0]
         
         return None
     
     def clean_company_name(self, name):
         """Clean up extracted company name"""
-        if not name:
-            return None
-            
-        # Remove HTML tags
-        name = re.sub(r'<[^>]+>', '', name)
-        
-        # Remove extra whitespace
-        name = re.sub(r'\s+', ' ', name).strip()
-        
-        # Remove common words that aren't part of company names
-        words_to_remove = [
-            'home', 'contact', 'about', 'us', 'privacy', 'policy',
-            'terms', 'conditions', 'cookies', 'sitemap', 'menu'
-        ]
-        for word in words_to_remove:
-            name = re.sub(r'\b' + word + r'\b', '', name, flags=re.IGNORECASE)
-        
-        # Remove extra whitespace again after word removal
-        name = re.sub(r'\s+', ' ', name).strip()
-        
-        # Remove trailing punctuation
-        name = name.rstrip('.,;:')
-        
-        return name if len(name) >= 3 else None
+        return clean_company_name(name)
     
-    def find_contact_url(self, base_url, content):
+    def find_contact_url(self, base_url, content, tree=None):
         """Find contact page URL from homepage content"""
         if not base_url or not content:
             return None
         
+        # Cheap substring test before walking the DOM
+        content_lower = content.lower()
+        if not any(keyword in content_lower for keyword in CONTACT_KEYWORDS):
+            return None
+        
+        if tree is None:
+            tree = LexborHTMLParser(content)
+        
+        # Rank candidate links by keyword preference, then document order, in a single DOM pass
+        ranked = []
+        for position, anchor in enumerate(tree.css('a[href]')):
+            href = anchor.attributes.get('href') or ''
+            match = self.contact_pattern.match(href)
+            if match:
+                ranked.append((match.lastindex, position, href))
+        
         contact_urls = []
+        seen = set()
         
-        # Extract potential contact page URLs
-        for pattern in self.contact_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                try:
-                    href = match.group(1)
-                    
-                    # Convert relative URLs to absolute
-                    if href.startswith('/'):
-                        # Remove any fragment or query
-                        base = base_url.split('#')[0].split('?')[0]
-                        if base.endswith('/'):
-                            href = base + href[1:]
-                        else:
-                            href = base + href
-                    elif not href.startswith(('http://', 'https://')):
-                        if base_url.endswith('/'):
-                            href = base_url + href
-                        else:
-                            href = base_url + '/' + href
-                    
-                    contact_urls.append(href)
-                except:
-                    continue
+        for _, _, href in sorted(ranked):
+            # Resolves relative, protocol-relative and '../' links against the homepage
+            href = urljoin(base_url, href)
+            if href not in seen:
+                seen.add(href)
+                contact_urls.append(href)
         
         # Return first contact URL found
         # Could be improved to check multiple and select best
@@ -182,29 +458,95 @@ class ImprovedAnalyzer:
         return None
     
     def analyze_domain(self, domain):
-        """Analyze a domain to extract company information"""
+        """Analyze a domain, reusing a cached result if it is still fresh or unchanged"""
+        key = domain.strip().lower()
+        stale = None
+        
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                cached_at, result, validators = cached
+                if time.monotonic() - cached_at < self.cache_ttl:
+                    self._cache.move_to_end(key)
+                    print(f"Using cached result for domain: {domain}")
+                    return dict(result)
+                del self._cache[key]
+                stale = (result, validators)
+        
+        # Revalidate an expired result with a conditional GET before re-analyzing
+        homepage = None
+        if stale is not None and stale[1]:
+            result, validators = stale
+            page = self.fetch_page(
+                validators['url'],
+                etag=validators['etag'],
+                last_modified=validators['last_modified']
+            )
+            if page is not None and page['status_code'] == 304:
+                print(f"Homepage for {domain} not modified, reusing cached result")
+                self._cache_result(key, result, validators)
+                return dict(result)
+            if page is not None:
+                homepage = page
+        
+        result, homepage = self._analyze_domain_uncached(domain, homepage)
+        
+        # Errors are not cached so the domain is retried next time
+        if result["status"] == "analyzed":
+            validators = None
+            if homepage['etag'] or homepage['last_modified']:
+                validators = {
+                    'url': homepage['url'],
+                    'etag': homepage['etag'],
+                    'last_modified': homepage['last_modified']
+                }
+            self._cache_result(key, result, validators)
+        
+        return result
+    
+    def _cache_result(self, key, result, validators):
+        """Store an analyzed result along with its homepage validators"""
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), dict(result), validators)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def invalidate_cache(self, domain):
+        """Drop any cached result for a domain"""
+        with self._cache_lock:
+            self._cache.pop(domain.strip().lower(), None)
+    
+    def _analyze_domain_uncached(self, domain, homepage=None):
+        """Analyze a domain to extract company information; returns (result, homepage)"""
         print(f"Analyzing domain: {domain}")
         
-        # Fetch homepage
-        result = self.fetch_homepage(domain)
+        # Fetch homepage unless it was already downloaded
+        if homepage is None:
+            homepage = self.fetch_homepage(domain)
         
-        if not result:
+        if not homepage:
             print(f"  Could not fetch homepage for {domain}")
             return {
                 "domain": domain,
                 "status": "error",
                 "company_name": None,
                 "contact_url": None
-            }
+            }, None
         
-        base_url = result['url']
-        content = result['content']
+        base_url = homepage['url']
+        content = homepage['content']
         
-        # Extract company name
-        company_name = self.extract_company_name(content)
+        # Parse once and share the DOM between both extractors
+        tree = LexborHTMLParser(content)
         
         # Find contact URL
-        contact_url = self.find_contact_url(base_url, content)
+        contact_url = self.find_contact_url(base_url, content, tree)
+        
+        # Extract company name
+        company_name = self.extract_company_name(content, tree)
         
         result = {
             "domain": domain,
@@ -217,19 +559,28 @@ class ImprovedAnalyzer:
         print(f"    Company name: {company_name}")
         print(f"    Contact URL: {contact_url}")
         
-        return result
+        return result, homepage
     
-    def analyze_domains(self, domains):
-        """Analyze multiple domains with delay between requests"""
-        results = []
-        
-        for domain in domains:
-            result = self.analyze_domain(domain)
-            results.append(result)
-            # Add delay between requests to be nice to servers
-            time.sleep(random.uniform(1, 3))
+    def _host_semaphore(self, domain):
+        """Get the throttle shared by all analyses of a host"""
+        host = domain.strip().lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        with self._host_semaphores_lock:
+            return self._host_semaphores[host]
+    
+    def _analyze_throttled(self, domain):
+        """Analyze a domain while holding its host's throttle"""
+        with self._host_semaphore(domain):
+            return self.analyze_domain(domain)
+    
+    def analyze_domains(self, domains, max_workers=MAX_DOMAIN_WORKERS):
+        """Analyze multiple domains concurrently and compile results in input order"""
+        if not domains:
+            return []
         
-        return results
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(domains))) as executor:
+            return list(executor.map(self._analyze_throttled, domains))
 
 # Example usage
 if __name__ == "__main__":
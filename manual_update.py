@@ -22,15 +22,17 @@ def update_domains(domain=None):
             }
             response = requests.put(url, json=data)
         
+        # Parse the body once; error pages may not be JSON
+        result = response.json() if response.headers.get('content-type', '').startswith('application/json') else None
+        
         # Print response
-        if response.status_code == 200:
-            result = response.json()
+        if response.status_code == 200 and result is not None:
             print("Update successful!")
             print(json.dumps(result, indent=2))
         else:
             print(f"Error: {response.status_code} - {response.text}")
         
-        return response.json()
+        return result
     except Exception as e:
         print(f"Error: {str(e)}")
         return None
@@ -4,9 +4,22 @@ Mock database for domain status tracking
 import json
 import os
 import logging
-import traceback
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 
+# Optional faster JSON encoder/decoder for the file-backed database
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Advisory file locks so several processes can share a file database (not available on Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -14,6 +27,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# File mode appends mutations to <db_file>.log; after this many entries the log is folded into the snapshot
+COMPACT_AFTER = 1000
+
 # Initial mock data
 INITIAL_DOMAINS = [
     {"domain": "ettaloves.com", "status": "pending", "company_name": None, "contact_url": None, "last_updated": "2023-03-20T12:00:00"},
@@ -23,220 +39,326 @@ INITIAL_DOMAINS = [
 ]
 
 class MockDatabase:
-    # Class-level variable to store domains in memory across instances
-    _domains_cache = None
+    # Class-level index of domain name -> record, shared across instances.
+    # Dicts keep insertion order, so listing preserves the order domains were added in.
+    _domains_by_name = None
+    
+    # Serializes file-mode loads and writes between threads; the fcntl lock covers other processes
+    _lock = threading.RLock()
+    # Lock files held by the thread owning _lock, so nested calls don't flock again
+    _held_lock_files = set()
     
     def __init__(self, db_file="domains_db.json", use_memory=True):
         self.db_file = db_file
+        self.log_file = db_file + ".log"
+        self.lock_file = db_file + ".lock"
         self.use_memory = use_memory
-        logger.info(f"Initializing MockDatabase (memory_mode: {use_memory})")
+        # File mode: snapshot + replayed log, reloaded whenever either file changes on disk
+        self._file_domains = None
+        self._log_entries = 0
+        # Snapshot and log (mtime, size) as last loaded or written by this instance
+        self._loaded_state = None
+        logger.info("Initializing MockDatabase (memory_mode: %s)", use_memory)
         self._ensure_db_exists()
     
+    @staticmethod
+    def _index_domains(domains):
+        """Build a domain name -> record index from a list of records"""
+        return {d["domain"]: dict(d) for d in domains}
+    
+    @staticmethod
+    def _read_domains_file(db_file):
+        """Read the domain list from a database file"""
+        if orjson is not None:
+            with open(db_file, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(db_file, 'r') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def _write_domains_file(db_file, domains):
+        """Write the domain list to a database file"""
+        if orjson is not None:
+            with open(db_file, 'wb') as f:
+                f.write(orjson.dumps(domains, option=orjson.OPT_INDENT_2))
+            return
+        with open(db_file, 'w') as f:
+            json.dump(domains, f, indent=2)
+    
+    @staticmethod
+    def _apply_update(record, status=None, company_name=None, contact_url=None, timestamp=None):
+        """Apply the non-empty fields of an update to a domain record"""
+        if status:
+            record["status"] = status
+        if company_name is not None:  # Allow empty string
+            record["company_name"] = company_name
+        if contact_url is not None:  # Allow empty string
+            record["contact_url"] = contact_url
+        record["last_updated"] = timestamp or datetime.now().isoformat()
+    
+    @contextmanager
+    def _locked(self):
+        """Hold the database lock; in file mode also hold an exclusive lock on <db_file>.lock"""
+        with MockDatabase._lock:
+            if self.use_memory or fcntl is None or self.lock_file in MockDatabase._held_lock_files:
+                yield
+                return
+            with open(self.lock_file, 'a') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                MockDatabase._held_lock_files.add(self.lock_file)
+                try:
+                    yield
+                finally:
+                    MockDatabase._held_lock_files.discard(self.lock_file)
+                    fcntl.flock(f, fcntl.LOCK_UN)
+    
+    @staticmethod
+    def _stat(path):
+        """A file's (mtime, size), or None if it doesn't exist"""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _file_state(self):
+        """The current (mtime, size) of the snapshot and the log"""
+        return self._stat(self.db_file), self._stat(self.log_file)
+    
     def _ensure_db_exists(self):
         """Initialize the database either in memory or file"""
+        with self._locked():
+            self._init_db()
+    
+    def _init_db(self):
+        """Initialize the database either in memory or file; the caller holds the lock"""
         try:
             # If we're using memory and cache already exists, we're done
-            if self.use_memory and MockDatabase._domains_cache is not None:
-                logger.info("Using existing in-memory database")
+            if self.use_memory and MockDatabase._domains_by_name is not None:
+                logger.debug("Using existing in-memory database")
                 return
-                
+            
             # If using memory but no cache exists yet, initialize it
             if self.use_memory:
                 logger.info("Initializing in-memory database")
-                MockDatabase._domains_cache = INITIAL_DOMAINS.copy()
+                MockDatabase._domains_by_name = self._index_domains(INITIAL_DOMAINS)
                 return
-                
+            
             # Otherwise fall back to file-based database
             if not os.path.exists(self.db_file):
-                logger.info(f"Creating file database at {self.db_file}")
+                logger.info("Creating file database at %s", self.db_file)
                 try:
-                    with open(self.db_file, 'w') as f:
-                        json.dump(INITIAL_DOMAINS, f, indent=2)
-                except Exception as e:
-                    logger.error(f"Error creating database file: {str(e)}")
-                    logger.error(traceback.format_exc())
+                    self._write_domains_file(self.db_file, INITIAL_DOMAINS)
+                    # A log left over from an earlier database must not be replayed onto the new one
+                    if os.path.exists(self.log_file):
+                        os.remove(self.log_file)
+                except Exception:
+                    logger.exception("Error creating database file %s", self.db_file)
                     # Fall back to memory mode
                     logger.info("Falling back to memory mode")
-                    self.use_memory = True
-                    MockDatabase._domains_cache = INITIAL_DOMAINS.copy()
-        except Exception as e:
-            logger.error(f"Critical error in _ensure_db_exists: {str(e)}")
-            logger.error(traceback.format_exc())
+                    self._switch_to_memory(self._index_domains(INITIAL_DOMAINS))
+                    return
+            
+            self._load_file_db()
+        except Exception:
+            logger.exception("Critical error in _ensure_db_exists")
             # Fall back to memory mode
             self.use_memory = True
-            if MockDatabase._domains_cache is None:
-                MockDatabase._domains_cache = INITIAL_DOMAINS.copy()
+            if MockDatabase._domains_by_name is None:
+                MockDatabase._domains_by_name = self._index_domains(INITIAL_DOMAINS)
+    
+    def _load_file_db(self):
+        """Load the snapshot file and replay the mutation log on top of it"""
+        logger.info("Loading file database from %s", self.db_file)
+        domains = self._index_domains(self._read_domains_file(self.db_file))
+        entries = 0
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn final line from an interrupted write
+                        continue
+                    if entry["op"] == "delete":
+                        domains.pop(entry["domain"], None)
+                    else:
+                        domains[entry["domain"]["domain"]] = entry["domain"]
+                    entries += 1
+        self._file_domains = domains
+        self._log_entries = entries
+        self._loaded_state = self._file_state()
+        logger.info("Loaded %d domains (%d log entries replayed)", len(domains), entries)
+        if entries >= COMPACT_AFTER:
+            self._compact()
+    
+    def _compact(self):
+        """Write the current state as a new snapshot and empty the log"""
+        self._write_domains_file(self.db_file, list(self._file_domains.values()))
+        # Replaying a stale log over the new snapshot is harmless, so truncating second is crash-safe
+        open(self.log_file, 'w').close()
+        self._log_entries = 0
+        self._loaded_state = self._file_state()
+        logger.info("Compacted file database %s", self.db_file)
+    
+    def _append_log(self, entries):
+        """Persist file-mode mutations; returns False (after switching to memory mode) if the file can't be written"""
+        try:
+            with open(self.log_file, 'a') as f:
+                f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            self._log_entries += len(entries)
+            self._loaded_state = self._file_state()
+            if self._log_entries >= COMPACT_AFTER:
+                self._compact()
+            return True
+        except Exception:
+            logger.exception("Error writing to database log %s", self.log_file)
+            # Fall back to memory mode
+            self._switch_to_memory(self._file_domains)
+            logger.info("Switched to memory mode")
+            return False
+    
+    def _switch_to_memory(self, domains_by_name):
+        """Continue in memory mode with the given records"""
+        self.use_memory = True
+        MockDatabase._domains_by_name = domains_by_name
+        self._file_domains = None
+    
+    def _store(self):
+        """The domain name -> record index backing this database; the caller holds the lock"""
+        if self.use_memory:
+            return MockDatabase._domains_by_name
+        # Another process (API, worker, reset_db) may have written since the last load
+        if self._file_state() != self._loaded_state:
+            self._load_file_db()
+        return self._file_domains
     
     def get_all_domains(self):
         """Get all domains from the database"""
         try:
-            if self.use_memory:
-                logger.info(f"Getting all domains from memory ({len(MockDatabase._domains_cache)})")
-                return MockDatabase._domains_cache.copy()
-                
-            logger.info(f"Getting all domains from file {self.db_file}")
-            try:
-                with open(self.db_file, 'r') as f:
-                    domains = json.load(f)
-                logger.info(f"Retrieved {len(domains)} domains from file")
+            with self._locked():
+                domains = list(self._store().values())
+                logger.debug("Getting all domains from %s (%d)", 'memory' if self.use_memory else self.db_file, len(domains))
                 return domains
-            except Exception as e:
-                logger.error(f"Error reading database file: {str(e)}")
-                logger.error(traceback.format_exc())
-                # Fall back to memory mode
-                self.use_memory = True
-                return MockDatabase._domains_cache.copy() if MockDatabase._domains_cache else []
-        except Exception as e:
-            logger.error(f"Error in get_all_domains: {str(e)}")
-            logger.error(traceback.format_exc())
+        except Exception:
+            logger.exception("Error in get_all_domains")
             return []
     
     def get_domain(self, domain):
         """Get a specific domain by name"""
         try:
-            logger.info(f"Getting domain: {domain}")
-            domains = self.get_all_domains()
-            for d in domains:
-                if d["domain"] == domain:
-                    logger.info(f"Found domain: {domain}")
-                    return d
-            logger.info(f"Domain not found: {domain}")
-            return None
-        except Exception as e:
-            logger.error(f"Error getting domain {domain}: {str(e)}")
-            logger.error(traceback.format_exc())
+            with self._locked():
+                d = self._store().get(domain)
+                logger.debug("Getting domain %s: %s", domain, "found" if d else "not found")
+                return d
+        except Exception:
+            logger.exception("Error getting domain %s", domain)
             return None
     
     def add_domain(self, domain):
         """Add a new domain to the database"""
         try:
-            logger.info(f"Adding domain: {domain}")
-            
-            # Check if domain already exists
-            if self.get_domain(domain):
-                logger.info(f"Domain {domain} already exists")
-                return False  # Domain already exists
-            
-            # Get all domains
-            domains = self.get_all_domains()
-            
-            # Create new domain object
-            new_domain = {
-                "domain": domain,
-                "status": "pending",
-                "company_name": None,
-                "contact_url": None,
-                "last_updated": datetime.now().isoformat()
-            }
-            
-            # Add to list
-            domains.append(new_domain)
-            
-            # Save changes
-            if self.use_memory:
-                MockDatabase._domains_cache = domains
-                logger.info(f"Added domain {domain} to memory database")
-            else:
-                try:
-                    with open(self.db_file, 'w') as f:
-                        json.dump(domains, f, indent=2)
-                    logger.info(f"Added domain {domain} to file database")
-                except Exception as e:
-                    logger.error(f"Error writing to database file: {str(e)}")
-                    logger.error(traceback.format_exc())
-                    # Fall back to memory mode
-                    self.use_memory = True
-                    MockDatabase._domains_cache = domains
-                    logger.info("Switched to memory mode")
-            
-            return True
-        except Exception as e:
-            logger.error(f"Error adding domain {domain}: {str(e)}")
-            logger.error(traceback.format_exc())
+            with self._locked():
+                # Check if domain already exists
+                if self.get_domain(domain):
+                    logger.debug("Domain %s already exists", domain)
+                    return False  # Domain already exists
+                
+                # Create new domain object
+                new_domain = {
+                    "domain": domain,
+                    "status": "pending",
+                    "company_name": None,
+                    "contact_url": None,
+                    "last_updated": datetime.now().isoformat()
+                }
+                
+                # Save changes
+                self._store()[domain] = new_domain
+                if self.use_memory:
+                    logger.debug("Added domain %s to memory database", domain)
+                elif self._append_log([{"op": "add", "domain": new_domain}]):
+                    logger.debug("Added domain %s to file database", domain)
+                
+                return True
+        except Exception:
+            logger.exception("Error adding domain %s", domain)
             return False
     
     def update_domain(self, domain, status=None, company_name=None, contact_url=None):
         """Update an existing domain's information"""
         try:
-            logger.info(f"Updating domain {domain} with status={status}, company_name={company_name}, contact_url={contact_url}")
-            
-            # Get all domains
-            domains = self.get_all_domains()
-            updated = False
-            
-            # Find and update the domain
-            for d in domains:
-                if d["domain"] == domain:
-                    if status:
-                        d["status"] = status
-                    if company_name is not None:  # Allow empty string
-                        d["company_name"] = company_name
-                    if contact_url is not None:  # Allow empty string
-                        d["contact_url"] = contact_url
-                    d["last_updated"] = datetime.now().isoformat()
-                    updated = True
-                    break
-            
-            # Save if updated
-            if updated:
+            with self._locked():
+                # Update the record in place
+                d = self._store().get(domain)
+                if d is None:
+                    logger.debug("Domain %s not found for update", domain)
+                    return False
+                self._apply_update(d, status, company_name, contact_url)
+                
+                # Save changes
                 if self.use_memory:
-                    MockDatabase._domains_cache = domains
-                    logger.info(f"Updated domain {domain} in memory database")
-                else:
-                    try:
-                        with open(self.db_file, 'w') as f:
-                            json.dump(domains, f, indent=2)
-                        logger.info(f"Updated domain {domain} in file database")
-                    except Exception as e:
-                        logger.error(f"Error writing to database file: {str(e)}")
-                        logger.error(traceback.format_exc())
-                        # Fall back to memory mode
-                        self.use_memory = True
-                        MockDatabase._domains_cache = domains
-                        logger.info("Switched to memory mode during update")
-            else:
-                logger.info(f"Domain {domain} not found for update")
-            
-            return updated
-        except Exception as e:
-            logger.error(f"Error updating domain {domain}: {str(e)}")
-            logger.error(traceback.format_exc())
+                    logger.debug("Updated domain %s in memory database (status=%s, company_name=%s, contact_url=%s)", domain, status, company_name, contact_url)
+                elif self._append_log([{"op": "update", "domain": d}]):
+                    logger.debug("Updated domain %s in file database (status=%s, company_name=%s, contact_url=%s)", domain, status, company_name, contact_url)
+                
+                return True
+        except Exception:
+            logger.exception("Error updating domain %s", domain)
             return False
     
+    def bulk_update_domains(self, updates):
+        """Apply a list of {"domain", "status", "company_name", "contact_url"} updates in one pass"""
+        try:
+            with self._locked():
+                # Index updates by domain name
+                updates_by_domain = {u["domain"]: u for u in updates}
+                
+                updated_domains = []
+                now = datetime.now().isoformat()
+                
+                # Look each record up and update it in place
+                store = self._store()
+                for update in updates_by_domain.values():
+                    d = store.get(update["domain"])
+                    if d is None:
+                        continue
+                    self._apply_update(
+                        d,
+                        update.get("status"),
+                        update.get("company_name"),
+                        update.get("contact_url"),
+                        timestamp=now
+                    )
+                    updated_domains.append(d)
+                
+                # Save once if anything changed
+                if updated_domains:
+                    if self.use_memory:
+                        logger.debug("Updated %d of %d domains in memory database", len(updated_domains), len(updates))
+                    elif self._append_log([{"op": "update", "domain": d} for d in updated_domains]):
+                        logger.debug("Updated %d of %d domains in file database", len(updated_domains), len(updates))
+                
+                return updated_domains
+        except Exception:
+            logger.exception("Error bulk updating domains")
+            return []
+    
     def delete_domain(self, domain):
         """Delete a domain from the database"""
         try:
-            logger.info(f"Deleting domain: {domain}")
-            
-            # Get all domains
-            domains = self.get_all_domains()
-            initial_count = len(domains)
-            
-            # Filter out the domain to delete
-            domains = [d for d in domains if d["domain"] != domain]
-            
-            # Check if any domain was removed
-            if len(domains) < initial_count:
+            with self._locked():
+                if self._store().pop(domain, None) is None:
+                    logger.debug("Domain %s not found for deletion", domain)
+                    return False
+                
+                # Save changes
                 if self.use_memory:
-                    MockDatabase._domains_cache = domains
-                    logger.info(f"Deleted domain {domain} from memory database")
-                else:
-                    try:
-                        with open(self.db_file, 'w') as f:
-                            json.dump(domains, f, indent=2)
-                        logger.info(f"Deleted domain {domain} from file database")
-                    except Exception as e:
-                        logger.error(f"Error writing to database file: {str(e)}")
-                        logger.error(traceback.format_exc())
-                        # Fall back to memory mode
-                        self.use_memory = True
-                        MockDatabase._domains_cache = domains
-                        logger.info("Switched to memory mode during delete")
+                    logger.debug("Deleted domain %s from memory database", domain)
+                elif self._append_log([{"op": "delete", "domain": domain}]):
+                    logger.debug("Deleted domain %s from file database", domain)
+                
                 return True
-            
-            logger.info(f"Domain {domain} not found for deletion")
+        except Exception:
+            logger.exception("Error deleting domain %s", domain)
             return False
-        except Exception as e:
-            logger.error(f"Error deleting domain {domain}: {str(e)}")
-            logger.error(traceback.format_exc())
-            return False
\ No newline at end of file
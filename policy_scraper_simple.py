@@ -3,9 +3,49 @@ Simple policy scraper for extracting company information from privacy policies
 """
 import requests
 import re
+import os
+import json
 import time
 import random
-from bs4 import BeautifulSoup
+import sqlite3
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urldefrag, urlparse
+from selectolax.lexbor import LexborHTMLParser
+
+# Optional linear-time (DFA) regex engine for the fused company pattern
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# URL variants probed concurrently when looking for a working base URL
+MAX_VARIANT_WORKERS = 4
+
+# Policy pages fetched concurrently per domain
+MAX_POLICY_WORKERS = 4
+
+# On-disk page cache; entries younger than the TTL (seconds) are served without a request
+DEFAULT_CACHE_PATH = "policy_cache.sqlite"
+DEFAULT_CACHE_TTL = 24 * 3600
+
+# Pages that answered 404/410 are not requested again for this long (seconds)
+MISSING_PAGE_TTL = 7 * 24 * 3600
+
+# How often each common policy path yielded a company name, kept across runs to try the best paths first
+DEFAULT_PATH_HITS_PATH = "policy_path_hits.json"
+
+# A name seen this many times in the first HEAD_SCAN_CHARS of a page is taken without scanning the rest
+HEAD_SCAN_CHARS = 4096
+CONFIDENT_MATCH_COUNT = 3
+
+# Any letter (Unicode-aware, same as str.isalpha); candidates without one are rejected
+_ALPHA_RE = re.compile(r'[^\W\d_]')
+
+# A line break (any str.splitlines boundary) or two spaces, with the whitespace around it;
+# each becomes one newline in page text, like stripping and splitting lines and headlines
+_TEXT_BREAK_RE = re.compile(r'\s*(?:[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]|  )\s*')
 
 class PolicyScraperSimple:
     """
@@ -13,7 +53,26 @@ class PolicyScraperSimple:
     from privacy policies and terms of service pages
     """
     
-    def __init__(self):
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH, cache_ttl=DEFAULT_CACHE_TTL, path_hits_path=DEFAULT_PATH_HITS_PATH):
+        # HTTP cache shared across runs, revalidated with ETag/Last-Modified (cache_path=None disables it)
+        self.cache_ttl = cache_ttl
+        self._cache_db = None
+        self._cache_lock = threading.Lock()
+        if cache_path:
+            try:
+                self._cache_db = sqlite3.connect(cache_path, check_same_thread=False)
+                self._cache_db.execute(
+                    "CREATE TABLE IF NOT EXISTS pages "
+                    "(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content TEXT, fetched_at REAL)"
+                )
+                self._cache_db.execute(
+                    "CREATE TABLE IF NOT EXISTS missing (url TEXT PRIMARY KEY, checked_at REAL)"
+                )
+                self._cache_db.commit()
+            except sqlite3.Error as e:
+                print(f"  Page cache unavailable, fetching without it: {str(e)}")
+                self._cache_db = None
+        
         # Common paths for privacy policies and terms
         self.policy_paths = [
             "/privacy",
@@ -29,32 +88,156 @@ class PolicyScraperSimple:
             "/impressum"      # German imprint
         ]
         
-        # Patterns for company identifiers
-        self.company_patterns = [
-            # Standard legal entity patterns
-            r"([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
+        # Per-path hit counts (path_hits_path=None keeps them in memory only)
+        self.path_hits_path = path_hits_path
+        self._path_hits = self._load_path_hits()
+        self._path_hits_lock = threading.Lock()
+        
+        # Link text identifying privacy/terms pages, matched in a single pass per link
+        self._link_kw_re = re.compile(r'privacy|privat|terms|legal|imprint', re.IGNORECASE)
+        
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+        
+        # Patterns for company identifiers; each captures the name in its own named group.
+        # Specific patterns come first so they win over the generic one at the same position.
+        company_patterns = [
             # Data controller patterns
-            r"data\s+controller\s+is\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
+            r"data\s+controller\s+is\s+(?P<controller>[A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
             # Operated by patterns
-            r"operated\s+by\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
+            r"operated\s+by\s+(?P<operator>[A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
             # Copyright owner patterns
-            r"(?:©|copyright|\(c\))\s*(?:20\d{2}(?:-20\d{2})?)\s+([A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))"
+            r"(?:©|copyright|\(c\))\s*(?:20\d{2}(?:-20\d{2})?)\s+(?P<copyright>[A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
+            # Standard legal entity patterns
+            r"(?P<entity>[A-Z][a-zA-Z0-9\s\&\-'.,]+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))"
         ]
+        # One alternation scans the text once; inline flags keep it portable between re and re2
+        self._company_pattern = (re2 or re).compile('(?is)' + '|'.join(company_patterns))
+    
+    def _load_path_hits(self):
+        """Load the persisted per-path hit counts"""
+        if not self.path_hits_path or not os.path.exists(self.path_hits_path):
+            return Counter()
+        try:
+            with open(self.path_hits_path, 'r') as f:
+                return Counter(json.load(f))
+        except Exception as e:
+            print(f"  Could not load policy path hits: {str(e)}")
+            return Counter()
+    
+    def _record_path_hit(self, url):
+        """Count a company name found at one of the common policy paths and persist the counts"""
+        path = urlparse(url).path.rstrip('/')
+        if path not in self.policy_paths:
+            return
+        with self._path_hits_lock:
+            self._path_hits[path] += 1
+            if not self.path_hits_path:
+                return
+            try:
+                with open(self.path_hits_path, 'w') as f:
+                    json.dump(self._path_hits, f, indent=2)
+            except Exception as e:
+                print(f"  Could not save policy path hits: {str(e)}")
+    
+    def _ordered_policy_paths(self):
+        """Common policy paths, most productive first (ties keep the default order)"""
+        with self._path_hits_lock:
+            return sorted(self.policy_paths, key=lambda path: -self._path_hits[path])
+    
+    def _cache_get(self, url):
+        """Look up a cached page as (etag, last_modified, content, fetched_at), or None"""
+        if self._cache_db is None:
+            return None
+        with self._cache_lock:
+            return self._cache_db.execute(
+                "SELECT etag, last_modified, content, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+    
+    def _cache_put(self, url, etag, last_modified, content):
+        """Store or refresh a cached page"""
+        if self._cache_db is None:
+            return
+        with self._cache_lock:
+            self._cache_db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, content, time.time())
+            )
+            self._cache_db.commit()
+    
+    def _mark_missing(self, url):
+        """Remember that a URL answered 404/410"""
+        if self._cache_db is None:
+            return
+        with self._cache_lock:
+            self._cache_db.execute("INSERT OR REPLACE INTO missing VALUES (?, ?)", (url, time.time()))
+            self._cache_db.commit()
+    
+    def _missing_urls(self, urls):
+        """The subset of urls that answered 404/410 within MISSING_PAGE_TTL"""
+        if self._cache_db is None or not urls:
+            return set()
+        with self._cache_lock:
+            rows = self._cache_db.execute(
+                f"SELECT url FROM missing WHERE checked_at > ? AND url IN ({','.join('?' * len(urls))})",
+                (time.time() - MISSING_PAGE_TTL, *urls)
+            ).fetchall()
+        return {row[0] for row in rows}
     
     def fetch_url(self, url, timeout=10):
-        """Fetch content from a URL with error handling"""
+        """Fetch content from a URL with error handling, via the page cache"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+            cached = self._cache_get(url)
+            headers = self.headers
+            if cached:
+                etag, last_modified, content, fetched_at = cached
+                if time.time() - fetched_at < self.cache_ttl:
+                    return content
+                
+                # Stale: revalidate with a conditional GET
+                headers = dict(self.headers)
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+            
             response = requests.get(url, headers=headers, timeout=timeout)
+            if response.status_code == 304 and cached:
+                self._cache_put(url, etag, last_modified, content)
+                return content
             if response.status_code == 200:
+                self._cache_put(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), response.text)
                 return response.text
+            if response.status_code in (404, 410):
+                self._mark_missing(url)
             return None
         except Exception as e:
             print(f"  Error fetching {url}: {str(e)}")
             return None
     
+    def _map_in_order(self, func, items, max_workers):
+        """Run func over items concurrently, yielding (item, result) in the original order; pending calls are cancelled once the caller stops iterating"""
+        if not items:
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(items)))
+        try:
+            futures = [(item, executor.submit(func, item)) for item in items]
+            for item, future in futures:
+                yield item, future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def probe_url(self, url, timeout=5):
+        """Check a URL with a HEAD request; returns (whether it answered 2xx, whether the host answered at all)"""
+        try:
+            response = requests.head(url, headers=self.headers, timeout=timeout, allow_redirects=True)
+            return response.status_code < 300, True
+        except Exception as e:
+            print(f"  Error probing {url}: {str(e)}")
+            return False, False
+    
     def get_base_url(self, domain):
         """Get the base URL for a domain by testing https and http"""
         urls = [
@@ -67,8 +250,17 @@ class PolicyScraperSimple:
         # Filter out None values
         urls = [url for url in urls if url]
         
-        for url in urls:
-            content = self.fetch_url(url)
+        # Probe all variants at once without downloading bodies, keeping the preferred order;
+        # later variants (e.g. http:// after a working https://) are cancelled
+        reachable = []
+        for url, (ok, answered) in self._map_in_order(self.probe_url, urls, MAX_VARIANT_WORKERS):
+            if ok:
+                return url
+            if answered:
+                reachable.append(url)
+        
+        # Some servers reject HEAD, so fall back to GET for hosts that answered
+        for url, content in self._map_in_order(self.fetch_url, reachable, MAX_VARIANT_WORKERS):
             if content:
                 return url
         
@@ -80,40 +272,32 @@ class PolicyScraperSimple:
             return []
         
         policy_urls = []
+        seen = set()
         
         # First try to find links in the homepage
-        soup = BeautifulSoup(homepage_content, 'html.parser')
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            link_text = link.get_text().lower()
+        tree = LexborHTMLParser(homepage_content)
+        for link in tree.css('a[href]'):
+            href = link.attributes.get('href') or ''
+            link_text = link.text()
             
             # Check if link text contains privacy/terms keywords
-            if any(keyword in link_text for keyword in ['privacy', 'privat', 'terms', 'legal', 'imprint']):
-                # Convert relative URLs to absolute
-                if href.startswith('/'):
-                    # Remove any fragment or query
-                    base = base_url.split('#')[0].split('?')[0]
-                    if base.endswith('/'):
-                        href = base + href[1:]
-                    else:
-                        href = base + href
-                elif not href.startswith(('http://', 'https://')):
-                    if base_url.endswith('/'):
-                        href = base_url + href
-                    else:
-                        href = base_url + '/' + href
+            if self._link_kw_re.search(link_text):
+                # Resolve relative URLs and drop the fragment; skip mailto:, javascript: etc.
+                href = urldefrag(urljoin(base_url, href.strip()))[0]
+                if not href.startswith(('http://', 'https://')):
+                    continue
                 
-                policy_urls.append(href)
-        
-        # Then try common paths
-        for path in self.policy_paths:
-            if base_url.endswith('/'):
-                policy_url = base_url + path[1:]
-            else:
-                policy_url = base_url + path
+                if href not in seen:
+                    seen.add(href)
+                    policy_urls.append(href)
+        
+        # Then try common paths, best historical hit rate first
+        for path in self._ordered_policy_paths():
+            policy_url = urljoin(base_url, path)
             
             # Don't add duplicates
-            if policy_url not in policy_urls:
+            if policy_url not in seen:
+                seen.add(policy_url)
                 policy_urls.append(policy_url)
         
         return policy_urls
@@ -123,55 +307,61 @@ class PolicyScraperSimple:
         if not html:
             return ""
         
-        soup = BeautifulSoup(html, 'html.parser')
+        tree = LexborHTMLParser(html)
         
         # Remove script and style elements
-        for element in soup(["script", "style"]):
-            element.extract()
+        tree.strip_tags(['script', 'style'])
         
         # Get text
-        text = soup.get_text()
+        text = tree.root.text() if tree.root else ""
         
-        # Break into lines and remove leading and trailing space on each
-        lines = (line.strip() for line in text.splitlines())
-        
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        
-        return text
+        # Put each line and multi-space separated headline on its own line and drop blank lines, in one pass
+        return _TEXT_BREAK_RE.sub('\n', text).strip()
     
     def extract_company_name(self, text):
         """Extract company name from policy text"""
         if not text:
             return None
         
-        candidates = []
-        
-        for pattern in self.company_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                try:
-                    company = match.group(1).strip()
-                    # Basic validation
-                    if len(company) >= 3 and any(c.isalpha() for c in company):
-                        candidates.append(company)
-                except:
-                    continue
+        counts = Counter()
+        head_checked = False
         
-        # Count occurrences and return most common
-        if candidates:
-            counts = {}
-            for candidate in candidates:
-                counts[candidate] = counts.get(candidate, 0) + 1
-            
-            sorted_candidates = sorted(counts.items(), key=lambda x: x[1], reverse=True)
-            return sorted_candidates[0][0]
+        for match in self._company_pattern.finditer(text):
+            # Once past the head of the page, stop if it already named one company often enough
+            if not head_checked and match.start() >= HEAD_SCAN_CHARS:
+                head_checked = True
+                if counts:
+                    best, n = counts.most_common(1)[0]
+                    if n >= CONFIDENT_MATCH_COUNT:
+                        return best
+            try:
+                # Only the group of the alternative that matched is set
+                company = next(v for v in match.groupdict().values() if v).strip()
+                # Basic validation
+                if len(company) >= 3 and _ALPHA_RE.search(company):
+                    counts[company] += 1
+            except:
+                continue
+        
+        # Return the most common candidate
+        if counts:
+            return counts.most_common(1)[0][0]
         
         return None
     
+    def check_policy_url(self, url):
+        """Fetch a policy page and extract a company name from it; returns (url, company_name)"""
+        print(f"  Checking policy URL: {url}")
+        content = self.fetch_url(url)
+        if not content:
+            return url, None
+        
+        # Extract text
+        text = self.extract_text_from_html(content)
+        
+        # Extract company name
+        return url, self.extract_company_name(text)
+    
     def scrape_domain(self, domain):
         """Scrape a domain to find company information from policies"""
         print(f"Scraping policies for domain: {domain}")
@@ -192,6 +382,12 @@ class PolicyScraperSimple:
         # Find policy URLs
         policy_urls = self.find_policy_urls(base_url, homepage_content)
         
+        # Skip pages that were missing last time
+        missing = self._missing_urls(policy_urls)
+        if missing:
+            print(f"  Skipping {len(missing)} policy URLs that were not found before")
+            policy_urls = [url for url in policy_urls if url not in missing]
+        
         if not policy_urls:
             print(f"  Could not find any policy URLs for {domain}")
             # Try company name extraction from homepage as fallback
@@ -202,24 +398,16 @@ class PolicyScraperSimple:
                 "company_name": company_name
             }
         
-        # Try each policy URL to find company information
-        for url in policy_urls:
-            print(f"  Checking policy URL: {url}")
-            content = self.fetch_url(url)
-            if content:
-                # Extract text
-                text = self.extract_text_from_html(content)
-                
-                # Extract company name
-                company_name = self.extract_company_name(text)
-                
-                if company_name:
-                    print(f"  Found company name in {url}: {company_name}")
-                    return {
-                        "domain": domain,
-                        "status": "analyzed",
-                        "company_name": company_name
-                    }
+        # Check the candidates concurrently but in priority order; the first one with a name wins and the rest are cancelled
+        for url, (_, company_name) in self._map_in_order(self.check_policy_url, policy_urls, MAX_POLICY_WORKERS):
+            if company_name:
+                print(f"  Found company name in {url}: {company_name}")
+                self._record_path_hit(url)
+                return {
+                    "domain": domain,
+                    "status": "analyzed",
+                    "company_name": company_name
+                }
         
         # If we get here, we couldn't find a company name in any policy
         print(f"  Could not find company name in any policy for {domain}")
@@ -3,6 +3,18 @@ import json
 import sys
 from datetime import datetime
 
+# Optional faster JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Advisory lock shared with MockDatabase's file mode (not available on Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 # Initial mock data
 INITIAL_DOMAINS = [
     {"domain": "ettaloves.com", "status": "pending", "company_name": None, "contact_url": None, "last_updated": "2023-03-20T12:00:00"},
@@ -11,25 +23,40 @@ INITIAL_DOMAINS = [
     {"domain": "www.racketworld.co.uk", "status": "pending", "company_name": None, "contact_url": None, "last_updated": "2023-03-20T12:15:00"}
 ]
 
-def reset_db(db_file="domains_db.json", verbose=True):
-    """Reset the database file to initial state"""
+def reset_db(db_file="domains_db.json", verbose=True, verify=False):
+    """Reset the database file to initial state; verify=True reads the file back to check it"""
     try:
         if verbose:
             print(f"Resetting database {db_file} to initial state...")
         
-        # Write initial data
-        with open(db_file, 'w') as f:
-            json.dump(INITIAL_DOMAINS, f, indent=2)
+        # Hold the lock MockDatabase takes, so a running API or worker never sees a half-written reset
+        with open(db_file + ".lock", 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            
+            # Write initial data
+            if orjson is not None:
+                with open(db_file, 'wb') as f:
+                    f.write(orjson.dumps(INITIAL_DOMAINS, option=orjson.OPT_INDENT_2))
+            else:
+                with open(db_file, 'w') as f:
+                    json.dump(INITIAL_DOMAINS, f, indent=2)
+            
+            # Drop the mutation log MockDatabase replays on top of the file
+            if os.path.exists(db_file + ".log"):
+                os.remove(db_file + ".log")
         
         if verbose:
             print(f"Successfully reset database with {len(INITIAL_DOMAINS)} domains")
         
-        # Verify the data was written
-        with open(db_file, 'r') as f:
-            domains = json.load(f)
+        # The written data is INITIAL_DOMAINS, so only read it back when asked to
+        domains = INITIAL_DOMAINS
+        if verify:
+            with open(db_file, 'rb') as f:
+                domains = orjson.loads(f.read()) if orjson is not None else json.loads(f.read())
         
         if verbose:
-            print(f"Verified database reset. Contains {len(domains)} domains:")
+            print(f"{'Verified database reset. ' if verify else ''}Contains {len(domains)} domains:")
             for domain in domains:
                 print(f"  - {domain['domain']}")
         
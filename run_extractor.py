@@ -1,66 +1,114 @@
 """
 Script to run the company name extractor on specified domains
 """
+import os
 import sys
 import json
-import argparse
 import time
 import random
+import argparse
+from multiprocessing import Manager
+from concurrent.futures import ProcessPoolExecutor
 from company_name_extractor import CompanyNameExtractor
 
-def extract_from_domains(domains, output_file=None):
+# Number of worker processes; parsing and regex work is CPU-bound, and two per core
+# keeps the cores busy while other workers wait on the network
+MAX_DOMAIN_WORKERS = 2 * (os.cpu_count() or 1)
+
+# Seconds between analyses of the same host across all workers, drawn at random per visit
+HOST_DELAY_RANGE = (1.0, 3.0)
+
+# Partial results are written to the output file every SAVE_EVERY domains
+SAVE_EVERY = 25
+
+# Per-process extractor, and the host schedule shared by all workers, set up by _init_worker
+_extractor = None
+_next_visit_by_host = None
+_next_visit_lock = None
+
+def _init_worker(next_visit_by_host, next_visit_lock):
+    """Create the extractor used by this worker process and attach the shared host schedule"""
+    global _extractor, _next_visit_by_host, _next_visit_lock
+    _extractor = CompanyNameExtractor()
+    _next_visit_by_host = next_visit_by_host
+    _next_visit_lock = next_visit_lock
+
+def _wait_for_host(domain):
+    """Sleep until the host's next free slot, reserving a later one for the next visit from any worker"""
+    host = domain.strip().lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    with _next_visit_lock:
+        # Wall-clock time, as the schedule is compared across processes
+        now = time.time()
+        start = max(now, _next_visit_by_host.get(host, now))
+        _next_visit_by_host[host] = start + random.uniform(*HOST_DELAY_RANGE)
+    if start > now:
+        time.sleep(start - now)
+
+def _extract_one(domain):
+    """Analyze one domain in a worker process, turning unexpected failures into an error result"""
+    try:
+        _wait_for_host(domain)
+        return _extractor.extract_company_name(domain)
+    except Exception as e:
+        print(f"  Error analyzing {domain}: {str(e)}")
+        return {
+            "domain": domain,
+            "status": "error",
+            "company_name": None,
+            "error": str(e)
+        }
+
+def _save_results(results, output_file):
+    """Write the results collected so far to the output file"""
+    with open(output_file, 'w') as f:
+        json.dump(results, f, indent=2)
+
+def extract_from_domains(domains, output_file=None, max_workers=MAX_DOMAIN_WORKERS):
     """
     Extract company names from a list of domains
     
+    Domains are analyzed in parallel worker processes, with visits to the same host spaced
+    HOST_DELAY_RANGE seconds apart across all of them; results are reported and saved in input order.
+    
     Args:
         domains: List of domains to analyze
         output_file: Optional file to save results
+        max_workers: Maximum number of worker processes
     
     Returns:
         List of extraction results
     """
-    extractor = CompanyNameExtractor()
     results = []
     
     print(f"Processing {len(domains)} domains...")
     
-    for i, domain in enumerate(domains):
-        print(f"[{i+1}/{len(domains)}] Analyzing {domain}")
-        
-        try:
-            # Process the domain
-            result = extractor.extract_company_name(domain)
-            results.append(result)
-            
-            # Print results
-            print(f"  Status: {result['status']}")
-            print(f"  Company name: {result['company_name']}")
+    try:
+        # Per-host visit times live in a manager process so every worker spaces requests to a host
+        with Manager() as manager, ProcessPoolExecutor(
+            max_workers=max(1, min(max_workers, len(domains))),
+            initializer=_init_worker,
+            initargs=(manager.dict(), manager.Lock())
+        ) as executor:
+            analyses = executor.map(_extract_one, domains)
             
-            # Save results after each domain if output file specified
-            if output_file:
-                with open(output_file, 'w') as f:
-                    json.dump(results, f, indent=2)
-            
-            # Add delay between domains
-            if i < len(domains) - 1:  # Skip delay after last domain
-                delay = random.uniform(1, 3)
-                print(f"  Waiting {delay:.2f} seconds before next domain...")
-                time.sleep(delay)
+            for i, (domain, result) in enumerate(zip(domains, analyses)):
+                print(f"[{i+1}/{len(domains)}] Analyzed {domain}")
+                results.append(result)
                 
-        except Exception as e:
-            print(f"  Error analyzing {domain}: {str(e)}")
-            results.append({
-                "domain": domain,
-                "status": "error",
-                "company_name": None,
-                "error": str(e)
-            })
-    
-    # Save final results if output file specified
-    if output_file:
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2)
-        print(f"Results saved to {output_file}")
+                # Print results
+                print(f"  Status: {result['status']}")
+                print(f"  Company name: {result['company_name']}")
+                
+                # Save partial results periodically if output file specified
+                if output_file and (i + 1) % SAVE_EVERY == 0:
+                    _save_results(results, output_file)
+    finally:
+        # Save final results if output file specified, including after Ctrl+C or a crash
+        if output_file:
+            _save_results(results, output_file)
+            print(f"Results saved to {output_file}")
     
     # Print summary
     success_count = sum(1 for r in results if r["status"] == "analyzed" and r["company_name"])
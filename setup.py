@@ -4,12 +4,16 @@ setup(
     name="companyfinder",
     version="0.1.0",
     packages=find_packages(),
+    # concurrent.futures' shutdown(cancel_futures=True) is new in 3.9
+    python_requires=">=3.9",
     install_requires=[
         "flask>=2.0.0",
         "gunicorn>=20.0.0",
+        "gevent>=20.0.0",
         "requests>=2.25.0",
         "python-dotenv>=0.15.0",
-        "beautifulsoup4>=4.9.0",
+        "orjson>=3.8.0",
+        "selectolax>=1.0.0",
     ],
     entry_points={
         "console_scripts": [
@@ -32,7 +36,6 @@ setup(
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
     ],
 )
\ No newline at end of file
@@ -2,9 +2,109 @@
 Simplified domain analyzer for the API service
 """
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import time
-import random
+import socket
+import logging
+import threading
+from collections import Counter, defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from selectolax.lexbor import LexborHTMLParser
+
+# Optional linear-time (DFA) regex engine for the company patterns
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Per-domain progress is logged at DEBUG; the application's logging config decides whether it is shown
+logger = logging.getLogger(__name__)
+
+# Number of domains analyzed concurrently by analyze_domains
+MAX_DOMAIN_WORKERS = 32
+
+# Concurrent analyses allowed against a single host
+MAX_ANALYSES_PER_HOST = 2
+
+# Minimum seconds between requests to the same host, counted from when the previous one was answered
+MIN_HOST_INTERVAL = 1.0
+
+# Pooled connections kept per host by the shared session
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+
+# Seconds to wait for a connection and for the response
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+
+# Homepage bytes downloaded per request. Footers and copyright lines sit at the end of the
+# document, so a page over the cap loses them first; this is sized to hold nearly all
+# homepages whole while still bounding runaway responses
+MAX_CONTENT_BYTES = 2 * 1024 * 1024
+CHUNK_SIZE = 8192
+
+# Analyzed domains kept in the result cache, and for how long (seconds)
+DEFAULT_CACHE_SIZE = 10000
+DEFAULT_CACHE_TTL = 24 * 3600
+
+# Resolved addresses kept by the opt-in process-wide DNS cache, and for how long (seconds).
+# getaddrinfo doesn't expose record TTLs, so every entry is kept for DNS_CACHE_TTL
+DNS_CACHE_SIZE = 4096
+DNS_CACHE_TTL = 300
+
+_dns_cache = OrderedDict()
+_dns_cache_lock = threading.Lock()
+_original_getaddrinfo = None
+
+def install_dns_cache():
+    """Put a TTL'd LRU cache in front of socket.getaddrinfo for the whole process (idempotent)"""
+    global _original_getaddrinfo
+    with _dns_cache_lock:
+        if _original_getaddrinfo is not None:
+            return
+        _original_getaddrinfo = socket.getaddrinfo
+    
+    def cached_getaddrinfo(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        with _dns_cache_lock:
+            cached = _dns_cache.get(key)
+            if cached is not None and now - cached[0] < DNS_CACHE_TTL:
+                _dns_cache.move_to_end(key)
+                return cached[1]
+        
+        # Failures raise and are not cached, so a transient resolver error is retried next time
+        addresses = _original_getaddrinfo(*args, **kwargs)
+        with _dns_cache_lock:
+            _dns_cache[key] = (now, addresses)
+            _dns_cache.move_to_end(key)
+            if len(_dns_cache) > DNS_CACHE_SIZE:
+                _dns_cache.popitem(last=False)
+        return addresses
+    
+    socket.getaddrinfo = cached_getaddrinfo
+
+def _compile_pattern(pattern):
+    """Compile a case-insensitive, dot-all pattern with re2 when available, else with re"""
+    if re2 is not None:
+        try:
+            # Inline flags keep the pattern portable between re and re2
+            return re2.compile('(?is)' + pattern)
+        except Exception:
+            # Syntax re2 doesn't support; fall back to the backtracking engine
+            pass
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL)
+
+# Contents of each <footer> element in raw markup, for callers that pass extract_company_name a page rather than its text
+_FOOTER_RE = _compile_pattern(r'<footer\b[^>]*>(.*?)</footer>')
+
+# Helpers for clean_company_name; _WS_RE also normalizes the visible text (NBSP and other Unicode spaces included)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+# Common words that aren't part of company names
+_STOPWORD_RE = re.compile(r'\b(?:home|contact|about|us|privacy|policy|terms|conditions)\b', re.IGNORECASE)
 
 class SimplifiedAnalyzer:
     """
@@ -12,9 +112,45 @@ class SimplifiedAnalyzer:
     without requiring complex dependencies like spaCy
     """
     
-    def __init__(self):
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, cache_ttl=DEFAULT_CACHE_TTL, dns_cache=False):
+        # Opt-in: the cache patches socket.getaddrinfo for the whole process, not just this analyzer
+        if dns_cache:
+            install_dns_cache()
+        
+        # LRU cache of analyzed domains as (timestamp, result), most recently used last
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Shared session so repeat requests to a host reuse pooled TCP/TLS connections
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        # Only retry transient failures; unreachable URL variants fail fast
+        retry = Retry(
+            total=2,
+            connect=0,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Per-host throttles so different hosts run in parallel but one host isn't hammered
+        self._host_semaphores = defaultdict(lambda: threading.Semaphore(MAX_ANALYSES_PER_HOST))
+        self._host_semaphores_lock = threading.Lock()
+        
+        # Earliest time the next request to each host may start, for MIN_HOST_INTERVAL spacing
+        self._next_slot_by_host = {}
+        self._next_slot_lock = threading.Lock()
+        
         # Simple regex patterns for company names in website footers and privacy policies
-        self.company_patterns = [
+        company_patterns = [
             # Standard copyright patterns
             r"(?:©|copyright|\(c\))\s*(?:20\d{2}(?:-20\d{2})?)\s+([A-Z][a-zA-Z0-9\s\&\-']+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
             # Just the copyright year and name without legal suffix
@@ -28,75 +164,164 @@ class SimplifiedAnalyzer:
             # Contact us / about us section company names
             r"(?:Contact|About)\s+([A-Z][a-zA-Z0-9\s\&\-']+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
             # Company with registered address
-            r"([A-Z][a-zA-Z0-9\s\&\-']+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))(?:\s+is\s+registered\s+at)",
+            r"([A-Z][a-zA-Z0-9\s\&\-']+(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))(?:\s+is\s+registered\s+at)"
+        ]
+        # One alternation scans the text once; each pattern has a single capture group, so
+        # exactly one group is set per match. At a given position earlier patterns win.
+        self.company_pattern = _compile_pattern('|'.join(company_patterns))
+        
+        # Patterns run over each footer's contents; each contributes its first match per footer
+        self.footer_patterns = [_compile_pattern(p) for p in [
             # Simple company name in footer (less reliable, will check if multiple occur)
-            r"<footer[^>]*>.*?([A-Z][a-zA-Z0-9\s\&\-']{2,50}(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.)).*?</footer>",
+            r"([A-Z][a-zA-Z0-9\s\&\-']{2,50}(?:Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|Pty\s+Ltd|S\.A\.))",
             # Try to find a company in very simple footer text
-            r"<footer[^>]*>.*?([A-Z][a-zA-Z0-9\s\&\-']{5,50}).*?</footer>"
-        ]
+            r"([A-Z][a-zA-Z0-9\s\&\-']{5,50})"
+        ]]
+    
+    def close(self):
+        """Release the pooled connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _homepage_urls(self, domain):
+        """Yield (host, url) homepage variants, most likely first: https before http, the given host before its www/bare twin"""
+        # If domain starts with www, also try without it, otherwise with it
+        other = domain[4:] if domain.startswith('www.') else f"www.{domain}"
+        for scheme in ('https', 'http'):
+            yield domain, f"{scheme}://{domain}"
+            yield other, f"{scheme}://{other}"
+    
+    def _resolves(self, host):
+        """Whether a host name resolves, telling a dead host apart from a refused port"""
+        try:
+            socket.getaddrinfo(host, None)
+            return True
+        except socket.gaierror:
+            return False
+    
+    def _wait_for_host(self, host):
+        """Sleep until the host's next free slot, reserving a later one for the next request; other hosts never wait"""
+        with self._next_slot_lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot_by_host.get(host, now))
+            self._next_slot_by_host[host] = start + MIN_HOST_INTERVAL
+        if start > now:
+            time.sleep(start - now)
+    
+    def _record_host_hit(self, host):
+        """Note that a host answered a request just now, so the next one waits MIN_HOST_INTERVAL from here"""
+        with self._next_slot_lock:
+            next_slot = time.monotonic() + MIN_HOST_INTERVAL
+            if next_slot > self._next_slot_by_host.get(host, 0):
+                self._next_slot_by_host[host] = next_slot
+    
+    def _read_capped(self, response):
+        """Read and decode at most MAX_CONTENT_BYTES of a streamed response body"""
+        # Stop reading once the cap is reached; the rest of the body is never transferred
+        chunks = []
+        total = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= MAX_CONTENT_BYTES:
+                break
+        body = b''.join(chunks)[:MAX_CONTENT_BYTES]
+        
+        # Decoded once, with the response's charset, so "©" on latin-1/cp1252 pages and
+        # NBSP (matched by \s only in str patterns) survive into the scanned text
+        try:
+            return body.decode(response.encoding or 'utf-8', errors='replace')
+        except LookupError:
+            # Unknown charset name in the Content-Type header
+            return body.decode('utf-8', errors='replace')
     
     def fetch_homepage(self, domain):
         """Fetch the homepage content of a domain"""
         try:
-            # Try different URL formats
-            urls = [
-                f"https://{domain}",
-                f"http://{domain}",
-                # If domain starts with www, try without it
-                f"https://{domain.replace('www.', '')}" if domain.startswith('www.') else None,
-                f"http://{domain.replace('www.', '')}" if domain.startswith('www.') else None,
-                # If domain doesn't start with www, try with it
-                f"https://www.{domain}" if not domain.startswith('www.') else None,
-                f"http://www.{domain}" if not domain.startswith('www.') else None
-            ]
-            
-            # Filter out None values
-            urls = [url for url in urls if url]
+            # Hosts that don't resolve; their other-scheme variant would fail the same way
+            unresolvable = set()
             
-            for url in urls:
+            # Variants are built lazily, so nothing past the first success is created or requested
+            for host, url in self._homepage_urls(domain):
+                if host in unresolvable:
+                    continue
                 try:
-                    print(f"  Trying {url}")
-                    response = requests.get(url, timeout=10)
-                    if response.status_code == 200:
-                        print(f"  Success with {url}")
-                        return response.text
+                    logger.debug("Trying %s", url)
+                    self._wait_for_host(host)
+                    response = self.session.get(url, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), stream=True)
+                    self._record_host_hit(host)
+                    try:
+                        if response.status_code == 200:
+                            logger.debug("Success with %s", url)
+                            return self._read_capped(response)
+                    finally:
+                        response.close()
+                except requests.exceptions.ConnectionError as e:
+                    logger.debug("Error with %s: %s", url, e)
+                    if not self._resolves(host):
+                        unresolvable.add(host)
                 except Exception as e:
-                    print(f"  Error with {url}: {str(e)}")
-                    continue
+                    logger.debug("Error with %s: %s", url, e)
             
             return None
         except Exception as e:
-            print(f"Error fetching {domain}: {str(e)}")
+            logger.warning("Error fetching %s: %s", domain, e)
             return None
     
-    def extract_company_name(self, text):
-        """Extract company name from text using simple patterns"""
+    def _candidates(self, matches):
+        """Valid company names captured by a sequence of matches"""
+        candidates = []
+        for match in matches:
+            try:
+                # Only the group of the alternative that matched is set
+                company = next(g for g in match.groups() if g is not None).strip()
+                # Validate: Must be at least 3 chars and contain a letter
+                if len(company) >= 3 and any(c.isalpha() for c in company):
+                    candidates.append(company)
+            except:
+                continue
+        return candidates
+    
+    def _visible_text(self, content):
+        """Split a page into its visible text and the text of each <footer>"""
+        tree = LexborHTMLParser(content)
+        
+        # Remove script and style elements
+        tree.strip_tags(['script', 'style', 'noscript'])
+        
+        # &nbsp; comes out as NBSP; fold it and other Unicode whitespace into single spaces
+        footers = [_WS_RE.sub(' ', footer.text(separator=' ')) for footer in tree.css('footer')]
+        text = _WS_RE.sub(' ', tree.body.text(separator=' ')) if tree.body else ''
+        return text, footers
+    
+    def extract_company_name(self, text, footers=None):
+        """Extract company name from page text and its <footer> texts using simple patterns"""
         if not text:
             return None
         
-        candidates = []
+        candidates = self._candidates(self.company_pattern.finditer(text))
         
-        for pattern in self.company_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                try:
-                    company = match.group(1).strip()
-                    # Validate: Must be at least 3 chars and contain a letter
-                    if len(company) >= 3 and any(c.isalpha() for c in company):
-                        candidates.append(company)
-                except:
-                    continue
+        # The loose footer patterns are only worth a scan when no reliable pattern matched
+        if not candidates:
+            # Without pre-extracted footers, text is raw markup
+            if footers is None:
+                footers = [footer.group(1) for footer in _FOOTER_RE.finditer(text)]
+            matches = []
+            for footer in footers:
+                for pattern in self.footer_patterns:
+                    match = pattern.search(footer)
+                    if match:
+                        matches.append(match)
+            candidates = self._candidates(matches)
         
         # If we found multiple candidates, take the most common one
         if candidates:
-            # Count occurrences
-            counts = {}
-            for candidate in candidates:
-                counts[candidate] = counts.get(candidate, 0) + 1
-            
-            # Sort by count and return the most common
-            sorted_candidates = sorted(counts.items(), key=lambda x: x[1], reverse=True)
-            return sorted_candidates[0][0]
+            return Counter(candidates).most_common(1)[0][0]
         
         return None
     
@@ -104,40 +329,68 @@ class SimplifiedAnalyzer:
         """Clean up the company name"""
         if not name:
             return None
-            
-        # Remove HTML tags
-        name = re.sub(r'<[^>]+>', '', name)
         
-        # Remove extra whitespace
-        name = re.sub(r'\s+', ' ', name).strip()
+        # Remove HTML tags; names captured by the patterns never contain any, so skip the pass for them
+        if '<' in name:
+            name = _TAG_RE.sub('', name)
         
-        # Remove common words that aren't part of company names
-        words_to_remove = ['home', 'contact', 'about', 'us', 'privacy', 'policy', 'terms', 'conditions']
-        for word in words_to_remove:
-            name = re.sub(r'\b' + word + r'\b', '', name, flags=re.IGNORECASE)
+        # Remove common words that aren't part of company names, in one pass
+        name = _STOPWORD_RE.sub('', name)
         
-        # Remove extra whitespace again after word removal
-        name = re.sub(r'\s+', ' ', name).strip()
+        # Collapse whitespace left by tags and removed words
+        name = _WS_RE.sub(' ', name).strip()
         
         return name if len(name) >= 3 else None
     
     def analyze_domain(self, domain):
+        """Analyze a domain, reusing a cached result if it is still fresh"""
+        key = domain.strip().lower()
+        
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                cached_at, result = cached
+                if time.monotonic() - cached_at < self.cache_ttl:
+                    self._cache.move_to_end(key)
+                    logger.debug("Using cached result for domain: %s", domain)
+                    return dict(result)
+                del self._cache[key]
+        
+        result = self._analyze_domain_uncached(domain)
+        
+        # Errors are not cached so the domain is retried next time
+        if result["status"] == "analyzed" and self.cache_size > 0:
+            with self._cache_lock:
+                self._cache[key] = (time.monotonic(), dict(result))
+                self._cache.move_to_end(key)
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        
+        return result
+    
+    def invalidate_cache(self, domain):
+        """Drop any cached result for a domain"""
+        with self._cache_lock:
+            self._cache.pop(domain.strip().lower(), None)
+    
+    def _analyze_domain_uncached(self, domain):
         """Analyze a single domain and extract company name"""
-        print(f"Analyzing domain: {domain}")
+        logger.debug("Analyzing domain: %s", domain)
         
         # Fetch homepage
         content = self.fetch_homepage(domain)
         
         if not content:
-            print(f"  Could not fetch homepage for {domain}")
+            logger.debug("Could not fetch homepage for %s", domain)
             return {
                 "domain": domain,
                 "status": "error",
                 "company_name": None
             }
         
-        # Extract company name
-        company_name = self.extract_company_name(content)
+        # Extract company name from the visible text, so the patterns scan words rather than markup and scripts
+        text, footers = self._visible_text(content)
+        company_name = self.extract_company_name(text, footers)
         
         # Clean company name
         company_name = self.clean_company_name(company_name)
@@ -148,20 +401,29 @@ class SimplifiedAnalyzer:
             "company_name": company_name
         }
         
-        print(f"  Results for {domain}: Company name: {company_name}")
+        logger.debug("Results for %s: Company name: %s", domain, company_name)
         return result
     
-    def analyze_domains(self, domains):
-        """Analyze multiple domains and compile results"""
-        results = []
-        
-        for domain in domains:
-            result = self.analyze_domain(domain)
-            results.append(result)
-            # Be nice to servers - add a random delay
-            time.sleep(random.uniform(1, 3))
+    def _host_semaphore(self, domain):
+        """Get the throttle shared by all analyses of a host"""
+        host = domain.strip().lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        with self._host_semaphores_lock:
+            return self._host_semaphores[host]
+    
+    def _analyze_throttled(self, domain):
+        """Analyze a domain while holding its host's throttle"""
+        with self._host_semaphore(domain):
+            return self.analyze_domain(domain)
+    
+    def analyze_domains(self, domains, max_workers=MAX_DOMAIN_WORKERS):
+        """Analyze multiple domains concurrently and compile results in input order"""
+        if not domains:
+            return []
         
-        return results
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(domains))) as executor:
+            return list(executor.map(self._analyze_throttled, domains))
 
 # Example usage
 if __name__ == "__main__":
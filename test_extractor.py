@@ -1,15 +1,23 @@
 """
 Test script for the company name extractor
 """
+import os
+import re
 import json
 import time
 import random
 from company_name_extractor import CompanyNameExtractor
 
+# Legal entity suffix ending a company name
+_SUFFIX_RE = re.compile(r'\b(Pty Ltd|Ltd|Limited|LLC|Inc|Corp|Corporation|GmbH|B\.V\.|S\.A\.)\s*$')
+
 def test_extraction(domains, output_file="test_extraction_results.json"):
     """
     Test company name extraction on a list of domains and save results to a file
     
+    Progress is written to output_file + ".ndjson", one result per line as domains
+    finish; the full JSON file is written once at the end, replacing the progress file.
+    
     Args:
         domains: List of domains to test
         output_file: Path to save results
@@ -19,36 +27,37 @@ def test_extraction(domains, output_file="test_extraction_results.json"):
     
     print(f"Testing extraction on {len(domains)} domains")
     
-    for i, domain in enumerate(domains):
-        print(f"[{i+1}/{len(domains)}] Processing {domain}")
-        
-        try:
-            # Extract company name
-            result = extractor.extract_company_name(domain)
-            results.append(result)
-            
-            # Print results
-            print(f"  Status: {result['status']}")
-            print(f"  Company name: {result['company_name']}")
+    with open(output_file + ".ndjson", 'w') as progress_file:
+        for i, domain in enumerate(domains):
+            print(f"[{i+1}/{len(domains)}] Processing {domain}")
             
-            # Save progress after each domain
-            with open(output_file, 'w') as f:
-                json.dump(results, f, indent=2)
+            try:
+                # Extract company name
+                result = extractor.extract_company_name(domain)
+                results.append(result)
+                
+                # Print results
+                print(f"  Status: {result['status']}")
+                print(f"  Company name: {result['company_name']}")
+                
+                # Add delay between requests to be nice to servers
+                delay = random.uniform(1, 3)
+                print(f"  Waiting {delay:.2f} seconds before next domain...")
+                time.sleep(delay)
             
-            # Add delay between requests to be nice to servers
-            delay = random.uniform(1, 3)
-            print(f"  Waiting {delay:.2f} seconds before next domain...")
-            time.sleep(delay)
+            except Exception as e:
+                print(f"  Error processing {domain}: {str(e)}")
+                # Add failed result
+                results.append({
+                    "domain": domain,
+                    "status": "error",
+                    "company_name": None,
+                    "error": str(e)
+                })
             
-        except Exception as e:
-            print(f"  Error processing {domain}: {str(e)}")
-            # Add failed result
-            results.append({
-                "domain": domain,
-                "status": "error",
-                "company_name": None,
-                "error": str(e)
-            })
+            # Save progress after each domain
+            progress_file.write(json.dumps(results[-1]) + "\n")
+            progress_file.flush()
     
     # Calculate success rate
     success_count = sum(1 for r in results if r["status"] == "analyzed" and r["company_name"])
@@ -61,9 +70,10 @@ def test_extraction(domains, output_file="test_extraction_results.json"):
     print(f"Company name not found: {not_found_count} ({not_found_count/len(domains)*100:.1f}%)")
     print(f"Errors: {error_count} ({error_count/len(domains)*100:.1f}%)")
     
-    # Save final results
+    # Save final results; the progress file is only kept if the run doesn't get this far
     with open(output_file, 'w') as f:
         json.dump(results, f, indent=2)
+    os.remove(output_file + ".ndjson")
     
     print(f"Results saved to {output_file}")
     
@@ -115,7 +125,7 @@ def add_domains_with_status():
             json.dump(combined_results, f, indent=2)
         
         print(f"Combined results saved with {len(combined_results)} total domains")
-        
+    
     except FileNotFoundError:
         print("No existing results file found. Run test_extraction() first.")
     except Exception as e:
@@ -173,24 +183,20 @@ def analyze_results(results_file="test_extraction_results.json"):
                 company = result["company_name"]
                 
                 # Extract legal suffix if present
-                suffixes = ["Ltd", "Limited", "LLC", "Inc", "Corp", "Corporation", "GmbH", "B.V.", "Pty Ltd", "S.A."]
-                found_suffix = None
-                for suffix in suffixes:
-                    if company.endswith(suffix) or f" {suffix}" in company:
-                        found_suffix = suffix
-                        break
-                
-                if found_suffix:
+                match = _SUFFIX_RE.search(company)
+                if match:
+                    found_suffix = match.group(1)
                     company_suffixes[found_suffix] = company_suffixes.get(found_suffix, 0) + 1
         
         # Sort suffixes by count
         sorted_suffixes = sorted(company_suffixes.items(), key=lambda x: x[1], reverse=True)
         
         print("\nMost common legal entity types:")
+        total_suffixes = sum(company_suffixes.values())
         for suffix, count in sorted_suffixes:
-            percentage = count / sum(company_suffixes.values()) * 100
+            percentage = count / total_suffixes * 100
             print(f"{suffix}: {count} ({percentage:.1f}%)")
-        
+    
     except FileNotFoundError:
         print(f"Results file {results_file} not found")
     except Exception as e:
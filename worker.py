@@ -4,6 +4,8 @@ import logging
 import os
 import sys
 import traceback
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from mock_db import MockDatabase
 
 # Configure logging - make sure it's very verbose
@@ -13,15 +15,77 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of domains processed concurrently
+MAX_DOMAIN_WORKERS = 16
+
+# Seconds between passes; the web process runs separately (see Procfile), so new domains are picked up by this poll
+IDLE_POLL_INTERVAL = 15
+
+# Startup passes tried before entering the periodic loop, if earlier ones fail
+STARTUP_ATTEMPTS = 3
+
+# Database shared by every pass, created on first use
+_db = None
+
+def _get_db():
+    """Get the shared database, initializing it on first use"""
+    global _db
+    if _db is None:
+        logger.info("Initializing database...")
+        _db = MockDatabase(use_memory=True)
+        logger.info("Database initialized successfully")
+    return _db
+
+# Domains analyzed more recently than this (seconds) are skipped on the next pass
+REANALYZE_AFTER = 3600
+
+def _recently_analyzed(record, now):
+    """Whether a domain record was analyzed within REANALYZE_AFTER seconds of now"""
+    if record.get("status") != "analyzed" or not record.get("last_updated"):
+        return False
+    try:
+        age = (now - datetime.fromisoformat(record["last_updated"])).total_seconds()
+    except ValueError:
+        return False
+    return age < REANALYZE_AFTER
+
+def _process_one(db, domain):
+    """Process a single domain and store the result"""
+    logger.info(f"Processing domain: {domain}")
+    try:
+        # Create test data for the domain
+        company_name = f"Company for {domain}"
+        contact_url = f"https://{domain}/contact"
+        
+        # Basic analysis without using the full analyzer
+        result = {
+            "domain": domain,
+            "status": "analyzed",
+            "company_name": company_name,
+            "contact_url": contact_url
+        }
+        
+        # Update database
+        db.update_domain(
+            domain=domain,
+            status=result["status"],
+            company_name=result["company_name"],
+            contact_url=result["contact_url"]
+        )
+        
+        logger.info(f"Updated {domain} with company: {company_name}, contact: {contact_url}")
+    
+    except Exception as e:
+        logger.error(f"Error processing {domain}: {str(e)}")
+        logger.error(traceback.format_exc())
+
 def process_domains_once():
-    """Process domains once without looping"""
+    """Process domains once without looping; returns False if the pass failed"""
     logger.info("Starting one-time domain processing...")
     
     try:
-        # Initialize database with in-memory mode
-        logger.info("Initializing database...")
-        db = MockDatabase(use_memory=True)
-        logger.info("Database initialized successfully")
+        # Reuse the in-memory database across passes
+        db = _get_db()
         
         # Get all domains
         try:
@@ -30,51 +94,28 @@ def process_domains_once():
         except Exception as e:
             logger.error(f"Error getting domains: {str(e)}")
             logger.error(traceback.format_exc())
-            return
+            return False
         
-        # Get all domains, not just pending
-        all_domains = [d["domain"] for d in domains]
-        logger.info(f"Processing all domains regardless of status: {all_domains}")
+        # Get all domains except those analyzed recently
+        now = datetime.now()
+        all_domains = [d["domain"] for d in domains if not _recently_analyzed(d, now)]
+        logger.info(f"Processing {len(all_domains)} domains not analyzed in the last {REANALYZE_AFTER}s: {all_domains}")
         
         if not all_domains:
             logger.info("No domains to process")
-            return
+            return True
         
-        # Process each domain
-        for domain in all_domains:
-            logger.info(f"Processing domain: {domain}")
-            try:
-                # Create test data for the domain
-                company_name = f"Company for {domain}"
-                contact_url = f"https://{domain}/contact"
-                
-                # Basic analysis without using the full analyzer
-                result = {
-                    "domain": domain,
-                    "status": "analyzed",
-                    "company_name": company_name,
-                    "contact_url": contact_url
-                }
-                
-                # Update database
-                db.update_domain(
-                    domain=domain,
-                    status=result["status"],
-                    company_name=result["company_name"],
-                    contact_url=result["contact_url"]
-                )
-                
-                logger.info(f"Updated {domain} with company: {company_name}, contact: {contact_url}")
-                
-            except Exception as e:
-                logger.error(f"Error processing {domain}: {str(e)}")
-                logger.error(traceback.format_exc())
+        # Process domains concurrently
+        with ThreadPoolExecutor(max_workers=min(MAX_DOMAIN_WORKERS, len(all_domains))) as executor:
+            list(executor.map(lambda domain: _process_one(db, domain), all_domains))
         
         logger.info("One-time domain processing complete")
-        
+        return True
+    
     except Exception as e:
         logger.error(f"Critical error in process_domains_once: {str(e)}")
         logger.error(traceback.format_exc())
+        return False
 
 # MAIN SCRIPT ENTRY POINT
 if __name__ == "__main__":
@@ -88,26 +129,22 @@ if __name__ == "__main__":
         env_vars = {k: v for k, v in os.environ.items() if not k.startswith(('PATH', 'PYTHONPATH'))}
         logger.info(f"Environment variables: {env_vars}")
         
-        # Process immediately three times to ensure it works
-        logger.info("PROCESSING DOMAINS - ATTEMPT 1")
-        process_domains_once()
-        
-        logger.info("PROCESSING DOMAINS - ATTEMPT 2")
-        process_domains_once()
-        
-        logger.info("PROCESSING DOMAINS - ATTEMPT 3")
-        process_domains_once()
+        # Process immediately, retrying with backoff only if the pass fails
+        for attempt in range(STARTUP_ATTEMPTS):
+            logger.info(f"PROCESSING DOMAINS - ATTEMPT {attempt + 1}")
+            if process_domains_once():
+                break
+            time.sleep(2 ** attempt)
         
         # Then run periodically with short interval
         logger.info("Entering periodic processing mode")
-        interval = 15  # seconds
         
         while True:
-            logger.info(f"Sleeping for {interval} seconds before next processing...")
-            time.sleep(interval)
+            logger.info(f"Sleeping for {IDLE_POLL_INTERVAL} seconds before next processing...")
+            time.sleep(IDLE_POLL_INTERVAL)
             logger.info("PERIODIC PROCESSING - Waking up to process domains again")
             process_domains_once()
-            
+    
     except Exception as e:
         logger.error(f"Fatal error in worker: {str(e)}")
         logger.error(traceback.format_exc())
\ No newline at end of file